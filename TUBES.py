@@ -2,21 +2,53 @@
 # Jalankan: streamlit run Stockify_CSV.py
 
 import streamlit as st
-from PIL import Image, ImageDraw
+import atexit
 import io
-import pandas as pd
-from datetime import datetime
+from datetime import date, datetime, timedelta
+import base64
+import bisect
 import csv
+import functools
+import hashlib
+import heapq
+from array import array
+from collections import Counter
+import json
 import os
-from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional
+import re
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, asdict, field
+from itertools import compress, islice
+from operator import attrgetter
+from typing import TYPE_CHECKING, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# pandas/numpy (~0.4s) baru di-import saat dibutuhkan (laporan, DataFrame),
+# supaya halaman lain tidak ikut menanggung biaya import-nya
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa file lock antar proses
+    fcntl = None
 
 # ======================
 # DATA MODEL
 # ======================
+LOW_STOCK_LIMIT = 5  # stok 1..5 dianggap low stock
+
 @dataclass
 class Barang:
     """Model untuk barang inventory"""
+    __slots__ = ('id', 'nama', 'jumlah', 'category', 'image_path', 'created_at')
+    
     id: str
     nama: str
     jumlah: int
@@ -54,336 +86,2387 @@ class Barang:
         """Dapatkan status stock"""
         if self.jumlah == 0:
             return ("🔴", "Out of Stock", "#FEE2E2", "#991B1B")
-        elif self.jumlah <= 5:
+        elif self.jumlah <= LOW_STOCK_LIMIT:
             return ("🟡", "Low Stock", "#FEF3C7", "#92400E")
         return ("🟢", "In Stock", "#D1FAE5", "#065F46")
 
+# ======================
+# STATISTIK
+# ======================
+@dataclass
+class StockStats:
+    """Counter statistik stok yang di-update inkremental (O(1) per perubahan)"""
+    total_items: int = 0
+    total_quantity: int = 0
+    low_stock: int = 0
+    out_of_stock: int = 0
+    per_category: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    
+    def tambah(self, jumlah: int, category: str):
+        """Masukkan satu barang ke statistik"""
+        self._ubah(jumlah, category, 1)
+    
+    def kurang(self, jumlah: int, category: str):
+        """Keluarkan satu barang dari statistik"""
+        self._ubah(jumlah, category, -1)
+    
+    def as_dict(self) -> Dict:
+        return {
+            "total_items": self.total_items,
+            "total_quantity": self.total_quantity,
+            "low_stock": self.low_stock,
+            "out_of_stock": self.out_of_stock,
+            "per_category": {k: dict(v) for k, v in self.per_category.items()}
+        }
+    
+    def _ubah(self, jumlah: int, category: str, sign: int):
+        self.total_items += sign
+        self.total_quantity += sign * jumlah
+        if jumlah == 0:
+            self.out_of_stock += sign
+        elif jumlah <= LOW_STOCK_LIMIT:
+            self.low_stock += sign
+        cat = self.per_category.setdefault(category, {"items": 0, "quantity": 0})
+        cat["items"] += sign
+        cat["quantity"] += sign * jumlah
+        if cat["items"] == 0:
+            del self.per_category[category]
+
+# ======================
+# COLUMNAR STORE
+# ======================
+class KolomStore:
+    """Snapshot kolomar (struct-of-arrays) dari data barang untuk report/DataFrame.
+    
+    ``jumlah`` disimpan di ``array('q')`` dan ``category`` di-dictionary-encode
+    ke ``array('i')``, sehingga ``to_frame`` cukup menyalin buffer numerik
+    (memcpy) alih-alih memanggil ``asdict`` per barang. Dibangun sekali per
+    versi data dari objek ``Barang`` lalu dibuang, bukan salinan permanen
+    kedua dari setiap barang.
+    """
+    
+    def __init__(self):
+        self.ids: List[str] = []
+        self.nama: List[str] = []
+        self.jumlah = array('q')
+        self.category_codes = array('i')
+        self.categories: List[str] = []
+        self.image_path: List[str] = []
+        self.created_at: List[str] = []
+        self._category_code: Dict[str, int] = {}
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    @classmethod
+    def dari(cls, barang_list: Iterable[Barang]) -> "KolomStore":
+        """Snapshot kolom dari barang saat ini"""
+        kolom = cls()
+        kolom.rebuild(list(barang_list))
+        return kolom
+    
+    def rebuild(self, barang_list: List[Barang]):
+        """Bangun ulang seluruh kolom sekaligus"""
+        self.__init__()
+        encode = self._encode
+        self.ids = [b.id for b in barang_list]
+        self.nama = [b.nama for b in barang_list]
+        self.jumlah = array('q', [b.jumlah for b in barang_list])
+        self.category_codes = array('i', [encode(b.category) for b in barang_list])
+        self.image_path = [b.image_path for b in barang_list]
+        self.created_at = [b.created_at for b in barang_list]
+    
+    def to_frame(self, columns: Optional[List[str]] = None) -> "pd.DataFrame":
+        """DataFrame dari kolom; kolom numerik disalin langsung dari buffer"""
+        import numpy as np
+        import pandas as pd
+        
+        columns = columns or FIELDNAMES
+        data = {}
+        for col in columns:
+            if col == 'jumlah':
+                data[col] = np.frombuffer(self.jumlah, dtype=np.int64).copy() if self.jumlah else np.zeros(0, np.int64)
+            elif col == 'category':
+                codes = np.frombuffer(self.category_codes, dtype=np.int32).copy() if self.category_codes else np.zeros(0, np.int32)
+                data[col] = pd.Categorical.from_codes(codes, categories=self.categories)
+            else:
+                data[col] = np.array(getattr(self, col if col != 'id' else 'ids'), dtype=object)
+        return pd.DataFrame(data, columns=columns, copy=False)
+    
+    def _encode(self, category: str) -> int:
+        code = self._category_code.get(category)
+        if code is None:
+            code = self._category_code[category] = len(self.categories)
+            self.categories.append(category)
+        return code
+
+# ======================
+# VIEW CACHE
+# ======================
+class ViewCache:
+    """Cache data turunan (DataFrame, agregat) yang ditandai versi data.
+    
+    ``get`` hanya memanggil ``builder`` bila versi data sudah berubah sejak
+    nilai terakhir dibangun. Parameter yang terus berganti (jam, tanggal,
+    ambang) diberikan sebagai ``tag``, bukan bagian dari key: satu entri per
+    jenis view, sehingga cache tidak tumbuh tanpa batas. Nilai yang
+    dikembalikan dipakai bersama, jadi jangan dimodifikasi in-place.
+    """
+    
+    def __init__(self):
+        self._entries: Dict[object, Tuple[int, object, object]] = {}
+    
+    def get(self, key, versi: int, builder: Callable[[], object], tag=None):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] != versi or entry[1] != tag:
+            entry = self._entries[key] = (versi, tag, builder())
+        return entry[2]
+    
+    def clear(self):
+        self._entries = {}
+
+# ======================
+# SEARCH INDEX
+# ======================
+class SearchIndex:
+    """Inverted index trigram untuk pencarian substring/prefix multi-field.
+    
+    ``fields`` memetakan nama field ke bobot ranking. Query dipecah per kata;
+    setiap kata harus cocok di salah satu field. Skor per kata: bobot field
+    x 3 (sama persis), 2 (prefix kata) atau 1 (substring).
+    """
+    
+    N = 3
+    
+    def __init__(self, fields: Dict[str, float]):
+        self.fields = fields
+        self._postings: Dict[str, Set] = {}
+        self._docs: Dict[object, Dict[str, str]] = {}
+        self._urutan: Dict[object, int] = {}  # urutan insert untuk tie-break ranking
+        self._seq = 0
+    
+    def __len__(self) -> int:
+        return len(self._docs)
+    
+    def tambah(self, key, values: Dict[str, object]):
+        """Index/re-index satu dokumen (no-op jika teksnya tidak berubah)"""
+        doc = {f: str(values.get(f) or "").lower() for f in self.fields}
+        lama = self._docs.get(key)
+        if lama == doc:
+            return
+        if lama is not None:
+            self._lepas(key)
+        else:
+            self._seq += 1
+            self._urutan[key] = self._seq
+        self._docs[key] = doc
+        for gram in self._grams_doc(doc):
+            self._postings.setdefault(gram, set()).add(key)
+    
+    def hapus(self, key):
+        """Keluarkan dokumen dari index"""
+        self._lepas(key)
+        self._urutan.pop(key, None)
+    
+    def _lepas(self, key):
+        doc = self._docs.pop(key, None)
+        if doc is None:
+            return
+        for gram in self._grams_doc(doc):
+            posting = self._postings.get(gram)
+            if posting is not None:
+                posting.discard(key)
+                if not posting:
+                    del self._postings[gram]
+    
+    def clear(self):
+        self._postings = {}
+        self._docs = {}
+        self._urutan = {}
+    
+    def cari(self, query: str, fields: Optional[List[str]] = None,
+             limit: Optional[int] = None) -> List:
+        """Cari key dokumen yang cocok, urut dari skor tertinggi"""
+        terms = query.lower().split()
+        if not terms:
+            return []
+        fields = fields or list(self.fields)
+        kandidat = None
+        for term in sorted(terms, key=len, reverse=True):
+            cocok = self._kandidat(term)
+            kandidat = cocok if kandidat is None else kandidat & cocok
+            if not kandidat:
+                return []
+        
+        hasil = []
+        for key in kandidat:
+            doc = self._docs[key]
+            skor = 0.0
+            for term in terms:
+                skor_term = max((self._skor(doc[f], term) * self.fields[f] for f in fields), default=0)
+                if not skor_term:
+                    break
+                skor += skor_term
+            else:
+                hasil.append((-skor, self._urutan[key], key))
+        if limit is not None:
+            hasil = heapq.nsmallest(limit, hasil)
+        else:
+            hasil.sort()
+        return [key for _, _, key in hasil]
+    
+    def _kandidat(self, term: str) -> Set:
+        if len(term) >= self.N:
+            grams = sorted((self._postings.get(g, set()) for g in self._grams(term)), key=len)
+            if not grams[0]:
+                return set()
+            return set(grams[0]).intersection(*grams[1:])
+        # Query pendek: gabungkan posting semua gram yang memuat term (O(jumlah gram))
+        hasil = set()
+        for gram, posting in self._postings.items():
+            if term in gram:
+                hasil |= posting
+        return hasil
+    
+    @classmethod
+    def _grams(cls, text: str) -> Set[str]:
+        if len(text) <= cls.N:
+            return {text} if text else set()
+        return {text[i:i + cls.N] for i in range(len(text) - cls.N + 1)}
+    
+    def _grams_doc(self, doc: Dict[str, str]) -> Set[str]:
+        grams = set()
+        for text in doc.values():
+            grams |= self._grams(text)
+        return grams
+    
+    @staticmethod
+    def _skor(text: str, term: str) -> int:
+        if term not in text:
+            return 0
+        if text == term:
+            return 3
+        if text.startswith(term) or (" " + term) in text:
+            return 2
+        return 1
+
+# ======================
+# STOCK INDEX
+# ======================
+class StockIndex:
+    """Index terurut (jumlah, key) global dan per kategori untuk query ambang stok.
+    
+    "Semua barang dengan stok <= X" (opsional per kategori) dijawab dengan
+    bisect dalam O(log N + k). Total item/jumlah per kategori dijaga
+    inkremental untuk grafik distribusi kategori.
+    """
+    
+    def __init__(self):
+        self._semua: List[tuple] = []
+        self._per_kategori: Dict[object, List[tuple]] = {}
+        self._total: Dict[object, List[int]] = {}  # category -> [items, jumlah]
+        self._nilai: Dict[object, tuple] = {}  # key -> (jumlah, category)
+    
+    def __len__(self) -> int:
+        return len(self._nilai)
+    
+    def tambah(self, key, jumlah: int, category):
+        """Index/re-index satu barang (no-op jika jumlah dan kategorinya sama)"""
+        lama = self._nilai.get(key)
+        if lama == (jumlah, category):
+            return
+        if lama is not None:
+            self.hapus(key)
+        self._nilai[key] = (jumlah, category)
+        bisect.insort(self._semua, (jumlah, key))
+        bisect.insort(self._per_kategori.setdefault(category, []), (jumlah, key))
+        total = self._total.setdefault(category, [0, 0])
+        total[0] += 1
+        total[1] += jumlah
+    
+    def hapus(self, key):
+        """Keluarkan barang dari index"""
+        lama = self._nilai.pop(key, None)
+        if lama is None:
+            return
+        jumlah, category = lama
+        self._buang(self._semua, (jumlah, key))
+        daftar = self._per_kategori[category]
+        self._buang(daftar, (jumlah, key))
+        total = self._total[category]
+        total[0] -= 1
+        total[1] -= jumlah
+        if not daftar:
+            del self._per_kategori[category]
+            del self._total[category]
+    
+    def clear(self):
+        self.__init__()
+    
+    def bangun(self, entries: Iterable[Tuple[object, int, object]]):
+        """Bangun ulang index dari (key, jumlah, category) sekaligus, tanpa insort per item"""
+        self.__init__()
+        nilai = self._nilai
+        for key, jumlah, category in entries:
+            nilai[key] = (jumlah, category)
+        # Sort key lalu sort stabil per jumlah = urut (jumlah, key) tanpa membandingkan
+        # tuple; daftar per kategori yang diisi berurutan otomatis ikut terurut
+        urut = sorted(nilai)
+        urut.sort(key=lambda key: nilai[key][0])
+        semua = self._semua
+        per_kategori = self._per_kategori
+        for key in urut:
+            jumlah, category = nilai[key]
+            entry = (jumlah, key)
+            semua.append(entry)
+            daftar = per_kategori.get(category)
+            if daftar is None:
+                daftar = per_kategori[category] = []
+            daftar.append(entry)
+        for category, daftar in per_kategori.items():
+            self._total[category] = [len(daftar), sum(jumlah for jumlah, _ in daftar)]
+    
+    def di_bawah(self, batas: int, category=None, minimal: Optional[int] = None) -> List:
+        """Key dengan minimal <= jumlah <= batas, urut dari stok terkecil"""
+        daftar = self._daftar(category)
+        awal = 0 if minimal is None else bisect.bisect_left(daftar, (minimal,))
+        akhir = bisect.bisect_left(daftar, (batas + 1,))
+        return [key for _, key in daftar[awal:akhir]]
+    
+    def hitung_di_bawah(self, batas: int, category=None, minimal: Optional[int] = None) -> int:
+        """Jumlah barang dengan minimal <= jumlah <= batas (O(log N))"""
+        daftar = self._daftar(category)
+        awal = 0 if minimal is None else bisect.bisect_left(daftar, (minimal,))
+        return max(0, bisect.bisect_left(daftar, (batas + 1,)) - awal)
+    
+    def per_kategori(self) -> Dict[object, Tuple[int, int]]:
+        """category -> (jumlah item, total stok)"""
+        return {cat: (items, jumlah) for cat, (items, jumlah) in self._total.items()}
+    
+    def _daftar(self, category) -> List[tuple]:
+        return self._semua if category is None else self._per_kategori.get(category, [])
+    
+    @staticmethod
+    def _buang(daftar: List[tuple], entry: tuple):
+        i = bisect.bisect_left(daftar, entry)
+        if i < len(daftar) and daftar[i] == entry:
+            del daftar[i]
+
+# ======================
+# INSTRUMENTATION
+# ======================
+LATENCY_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Metrics:
+    """Histogram latensi, jumlah panggilan dan byte tertulis per operasi.
+    
+    Saat ``enabled`` False, ``diukur`` hanya menambah satu pengecekan atribut
+    per panggilan. Bucket histogram kumulatif seperti Prometheus; p50/p99
+    diperkirakan dari batas atas bucket.
+    """
+    
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+    
+    def reset(self):
+        with self._lock:
+            self._buckets: Dict[str, List[int]] = {}
+            self._sum: Dict[str, float] = {}
+            self._bytes: Dict[str, int] = {}
+    
+    def catat(self, nama: str, detik: float):
+        with self._lock:
+            buckets = self._buckets.get(nama)
+            if buckets is None:
+                buckets = self._buckets[nama] = [0] * (len(LATENCY_BUCKETS) + 1)
+                self._sum[nama] = 0.0
+            buckets[bisect.bisect_left(LATENCY_BUCKETS, detik)] += 1
+            self._sum[nama] += detik
+    
+    def catat_bytes(self, target: str, n: int):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._bytes[target] = self._bytes.get(target, 0) + n
+    
+    def ringkasan(self) -> List[Dict]:
+        """Satu baris per operasi, diurutkan dari total waktu terbesar"""
+        with self._lock:
+            data = [(nama, list(b), self._sum[nama]) for nama, b in self._buckets.items()]
+        rows = []
+        for nama, buckets, total in data:
+            count = sum(buckets)
+            rows.append({
+                "op": nama,
+                "count": count,
+                "total_ms": total * 1e3,
+                "mean_ms": total / count * 1e3,
+                "p50_ms": self._kuantil(buckets, count, 0.50) * 1e3,
+                "p99_ms": self._kuantil(buckets, count, 0.99) * 1e3,
+            })
+        return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+    
+    def bytes_written(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._bytes)
+    
+    def to_json(self) -> str:
+        return json.dumps({"latency": self.ringkasan(), "bytes_written": self.bytes_written()}, indent=2)
+    
+    def to_prometheus(self) -> str:
+        """Format teks exposition Prometheus"""
+        with self._lock:
+            data = [(nama, list(b), self._sum[nama]) for nama, b in sorted(self._buckets.items())]
+            byte_data = sorted(self._bytes.items())
+        lines = ["# TYPE stockify_latency_seconds histogram"]
+        for nama, buckets, total in data:
+            kumulatif = 0
+            for batas, n in zip(LATENCY_BUCKETS + (float("inf"),), buckets):
+                kumulatif += n
+                le = "+Inf" if batas == float("inf") else repr(batas)
+                lines.append(f'stockify_latency_seconds_bucket{{op="{nama}",le="{le}"}} {kumulatif}')
+            lines.append(f'stockify_latency_seconds_sum{{op="{nama}"}} {total}')
+            lines.append(f'stockify_latency_seconds_count{{op="{nama}"}} {kumulatif}')
+        lines.append("# TYPE stockify_bytes_written_total counter")
+        for target, n in byte_data:
+            lines.append(f'stockify_bytes_written_total{{target="{target}"}} {n}')
+        return "\n".join(lines) + "\n"
+    
+    @staticmethod
+    def _kuantil(buckets: List[int], count: int, q: float) -> float:
+        target = q * count
+        kumulatif = 0
+        for batas, n in zip(LATENCY_BUCKETS, buckets):
+            kumulatif += n
+            if kumulatif >= target:
+                return batas
+        return LATENCY_BUCKETS[-1]
+
+
+@st.cache_resource
+def _metrics() -> Metrics:
+    """Satu registry per proses; skrip dieksekusi ulang tiap rerun, registry tidak"""
+    return Metrics(enabled=os.environ.get("STOCKIFY_METRICS") == "1")
+
+
+METRICS = _metrics()
+
+
+def diukur(fn):
+    """Catat latensi fungsi/method ke METRICS (nama = __qualname__)"""
+    nama = fn.__qualname__
+    
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        if not METRICS.enabled:
+            return fn(*args, **kwargs)
+        mulai = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            METRICS.catat(nama, time.perf_counter() - mulai)
+    return wrapper
+
+# ======================
+# STORAGE LAYER
+# ======================
+FIELDNAMES = ['id', 'nama', 'jumlah', 'category', 'image_path', 'created_at']
+
+
+def _barang_dari_row(row: Dict) -> Barang:
+    """Ubah satu baris CSV/jurnal menjadi Barang"""
+    row = dict(row)
+    row['jumlah'] = int(row['jumlah'])
+    return Barang(**row)
+
+# ======================
+# CSV LOADER
+# ======================
+SNAPSHOT_MIN_BYTES = 1024 * 1024  # CSV lebih kecil dibaca per baris, tanpa pandas/snapshot
+MAX_LOAD_ERRORS = 1000
+_JUMLAH_VALID = r"^\s*\d{1,18}\s*$"  # pasti lolos int(), tanpa overflow int64
+
+
+def _validasi_row(row: Dict[Optional[str], Optional[str]]) -> Barang:
+    """Validasi satu baris CSV inventory menjadi Barang (ValueError berisi alasannya)"""
+    if None in row:
+        raise ValueError(f"expected {len(FIELDNAMES)} fields, got more")
+    barang_id = row.get('id') or ""
+    if not barang_id.strip():
+        raise ValueError("missing 'id'")
+    try:
+        jumlah = int(row.get('jumlah'))
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid 'jumlah': {row.get('jumlah')!r}")
+    if jumlah < 0:
+        raise ValueError("'jumlah' cannot be negative")
+    return Barang(id=barang_id, nama=row.get('nama') or "", jumlah=jumlah,
+                  category=row.get('category') or "", image_path=row.get('image_path') or "",
+                  created_at=row.get('created_at') or "")
+
+
+def _cek_header(header: Iterable[str]):
+    hilang = [col for col in ('id', 'jumlah') if col not in header]
+    if hilang:
+        raise ValueError(f"CSV is missing column(s): {', '.join(hilang)}")
+
+
+def _parse_csv_per_baris(data: bytes) -> Tuple[List[Barang], List[str]]:
+    """Parse + validasi per baris dengan modul csv (file kecil, atau CSV yang rusak)"""
+    reader = csv.DictReader(io.StringIO(data.decode('utf-8', errors='replace'), newline=''))
+    _cek_header(reader.fieldnames or [])
+    items: Dict[str, Barang] = {}
+    baris: Dict[str, int] = {}
+    errors = []
+    for nomor, row in enumerate(reader, 1):
+        try:
+            barang = _validasi_row(row)
+        except ValueError as e:
+            errors.append((nomor, f"Row {nomor}: {e}"))
+            continue
+        if barang.id in items:
+            lama = baris[barang.id]
+            errors.append((lama, f"Row {lama}: duplicate id {barang.id!r} (later row kept)"))
+            del items[barang.id]  # urutan mengikuti baris terakhir, sama dengan jalur vektor
+        items[barang.id] = barang
+        baris[barang.id] = nomor
+    return list(items.values()), [pesan for _, pesan in sorted(errors)]
+
+
+def _baca_kolom(data: bytes) -> Optional[Tuple[Dict[str, list], "np.ndarray"]]:
+    """Kolom CSV sebagai list string + mask baris yang lolos cek vektor (id terisi, jumlah angka).
+    
+    Memakai pyarrow.csv (multi-thread) jika tersedia, jika tidak pandas C engine.
+    None jika CSV tidak bisa di-parse utuh.
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+        from pyarrow import csv as pa_csv
+    except ImportError:
+        pa = None
+    if pa is not None:
+        try:
+            table = pa_csv.read_csv(io.BytesIO(data), convert_options=pa_csv.ConvertOptions(
+                column_types={col: pa.string() for col in FIELDNAMES}, strings_can_be_null=False))
+        except pa.ArrowInvalid:
+            return None
+        _cek_header(table.column_names)
+        valid = pc.and_(pc.match_substring_regex(table['id'], r"\S"),
+                        pc.match_substring_regex(table['jumlah'], _JUMLAH_VALID))
+        kolom = {col: table[col].to_pylist() if col in table.column_names else [""] * table.num_rows
+                 for col in FIELDNAMES}
+        return kolom, valid.to_numpy().astype(bool)
+    
+    import pandas as pd
+    
+    try:
+        df = pd.read_csv(io.BytesIO(data), dtype=str, keep_default_na=False).fillna("")
+    except ValueError:
+        return None
+    _cek_header(df.columns)
+    valid = df['id'].str.contains(r"\S") & df['jumlah'].str.contains(_JUMLAH_VALID)
+    kolom = {col: df[col].tolist() if col in df.columns else [""] * len(df) for col in FIELDNAMES}
+    return kolom, valid.to_numpy(dtype=bool).copy()
+
+
+def _parse_csv_vektor(data: bytes) -> Tuple[List[Barang], List[str]]:
+    """Parse CSV secara vektor lalu bangun Barang langsung dari kolom.
+    
+    Hanya baris yang gagal cek vektor yang divalidasi ulang per baris (untuk
+    pesan error-nya). CSV yang tidak bisa di-parse utuh (mis. jumlah kolom
+    tidak konsisten) jatuh ke parser per baris supaya baris lain tetap terbaca.
+    """
+    import numpy as np
+    
+    hasil = _baca_kolom(data)
+    if hasil is None:
+        return _parse_csv_per_baris(data)
+    kolom, valid = hasil
+    
+    errors = []
+    diperbaiki: Dict[int, Barang] = {}  # baris yang gagal cek vektor tapi lolos validasi per baris
+    for i in np.flatnonzero(~valid):
+        try:
+            diperbaiki[i] = _validasi_row({col: kolom[col][i] for col in FIELDNAMES})
+        except ValueError as e:
+            errors.append((i, f"Row {i + 1}: {e}"))
+            continue
+        valid[i] = True
+    
+    # Id ganda (jarang): baris terakhir yang dipakai, di posisi baris itu
+    ids = kolom['id']
+    dipakai = valid.copy()
+    baris_valid = np.flatnonzero(valid)
+    if len(set(map(ids.__getitem__, baris_valid))) != len(baris_valid):
+        terakhir = {ids[i]: i for i in baris_valid}
+        dipakai[:] = False
+        dipakai[list(terakhir.values())] = True
+        for i in np.flatnonzero(valid & ~dipakai):
+            errors.append((i, f"Row {i + 1}: duplicate id {ids[i]!r} (later row kept)"))
+    
+    vektor = dipakai.copy()
+    vektor[list(diperbaiki)] = False
+    if not vektor.all():
+        kolom = {col: list(compress(nilai, vektor)) for col, nilai in kolom.items()}
+    barang_list = list(map(Barang, kolom['id'], kolom['nama'], map(int, kolom['jumlah']),
+                           kolom['category'], kolom['image_path'], kolom['created_at']))
+    for i in sorted(diperbaiki):
+        if dipakai[i]:
+            barang_list.insert(int(np.count_nonzero(dipakai[:i])), diperbaiki[i])
+    return barang_list, [pesan for _, pesan in sorted(errors)]
+
+
+def _ringkas_errors(errors: List[str]) -> List[str]:
+    if len(errors) <= MAX_LOAD_ERRORS:
+        return errors
+    return errors[:MAX_LOAD_ERRORS] + [f"... and {len(errors) - MAX_LOAD_ERRORS} more invalid rows"]
+
+
+def _sha256_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for blok in iter(lambda: f.read(1 << 20), b''):
+            h.update(blok)
+    return h.hexdigest()
+
+
+class CsvSnapshot:
+    """Cache biner (Arrow IPC) hasil parse CSV di ``<csv>.snapshot``.
+    
+    Metadata snapshot menyimpan kunci CSV sumbernya (ukuran, mtime, sha256)
+    dan error validasinya. Start berikutnya me-memory-map snapshot alih-alih
+    mem-parse ulang CSV; jika mtime berubah tapi ukuran sama (mis. ``touch``)
+    hash isi yang menentukan. Tanpa pyarrow snapshot tidak dipakai.
+    """
+    
+    def __init__(self, csv_filename: str):
+        self.csv_filename = csv_filename
+        self.filename = csv_filename + ".snapshot"
+    
+    def load(self) -> Optional[Tuple[List[Barang], List[str]]]:
+        """(barang, errors) dari snapshot, atau None jika tidak ada/kedaluwarsa"""
+        if not os.path.exists(self.filename):
+            return None
+        try:
+            import pyarrow as pa
+            
+            info = os.stat(self.csv_filename)
+            with pa.memory_map(self.filename) as source:
+                reader = pa.ipc.open_file(source)
+                meta = json.loads(reader.schema.metadata[b"stockify"])
+                if meta["size"] != info.st_size:
+                    return None
+                if meta["mtime_ns"] != info.st_mtime_ns and meta["sha256"] != _sha256_file(self.csv_filename):
+                    return None
+                table = reader.read_all()
+                kolom = [table.column(col).to_pylist() for col in FIELDNAMES]
+        except Exception as e:  # snapshot hanya cache; jika rusak, CSV di-parse ulang
+            print(f"Ignoring CSV snapshot {self.filename}: {e}")
+            return None
+        return list(map(Barang, *kolom)), meta["errors"]
+    
+    def simpan(self, barang_list: List[Barang], errors: List[str], info: os.stat_result, sha256: str):
+        """Tulis snapshot secara atomik (dilewati tanpa pyarrow)"""
+        try:
+            import pyarrow as pa
+        except ImportError:
+            return
+        meta = {"size": info.st_size, "mtime_ns": info.st_mtime_ns, "sha256": sha256, "errors": errors}
+        kolom = {col: [getattr(b, col) for b in barang_list] for col in FIELDNAMES}
+        table = pa.table({col: pa.array(nilai, pa.int64() if col == 'jumlah' else pa.string())
+                          for col, nilai in kolom.items()})
+        table = table.replace_schema_metadata({"stockify": json.dumps(meta)})
+        tmp = f"{self.filename}.{threading.get_ident()}.tmp"
+        try:
+            with pa.OSFile(tmp, 'wb') as sink, pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+            os.replace(tmp, self.filename)
+        except OSError as e:
+            print(f"Error writing CSV snapshot: {e}")
+
+
+def muat_csv(filename: str) -> Tuple[List[Barang], List[str]]:
+    """Muat barang dari CSV beserta daftar error validasi per baris.
+    
+    File kecil di-parse per baris. File besar memakai snapshot biner jika
+    masih cocok; jika tidak, di-parse secara vektor lalu snapshot ditulis.
+    """
+    info = os.stat(filename)
+    snapshot = CsvSnapshot(filename)
+    if info.st_size >= SNAPSHOT_MIN_BYTES:
+        hasil = snapshot.load()
+        if hasil is not None:
+            return hasil
+    with open(filename, 'rb') as f:
+        data = f.read()
+    if len(data) < SNAPSHOT_MIN_BYTES:
+        barang_list, errors = _parse_csv_per_baris(data)
+        return barang_list, _ringkas_errors(errors)
+    barang_list, errors = _parse_csv_vektor(data)
+    errors = _ringkas_errors(errors)
+    # Kunci dari stat sebelum dibaca + hash byte yang di-parse: perubahan di antaranya
+    # membuat mtime tidak cocok, lalu hash yang memutuskan
+    snapshot.simpan(barang_list, errors, info, hashlib.sha256(data).hexdigest())
+    return barang_list, errors
+
+
+class CsvStorage:
+    """Penyimpanan snapshot penuh: setiap perubahan menulis ulang seluruh CSV"""
+    
+    FORMAT = "CSV (Comma-Separated Values)"
+    
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.load_errors: List[str] = []
+    
+    def load(self) -> List[Barang]:
+        """Baca seluruh barang dari CSV; baris tidak valid dilewati dan dicatat di load_errors"""
+        self.load_errors = []
+        if not os.path.exists(self.filename):
+            return []
+        barang_list, self.load_errors = muat_csv(self.filename)
+        return barang_list
+    
+    def simpan_semua(self, barang_list: List[Barang]):
+        """Tulis ulang seluruh CSV"""
+        with open(self.filename, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+            writer.writeheader()
+            writer.writerows(asdict(b) for b in barang_list)
+            METRICS.catat_bytes("csv", f.tell())
+    
+    def simpan_upsert(self, barang: Barang, semua: Callable[[], List[Barang]]):
+        """Simpan barang baru/berubah"""
+        self.simpan_semua(semua())
+    
+    def simpan_hapus(self, barang_id: str, semua: Callable[[], List[Barang]]):
+        """Simpan penghapusan barang"""
+        self.simpan_semua(semua())
+    
+    def simpan_banyak(self, upserts: List[Barang], hapus: List[str],
+                      semua: Callable[[], List[Barang]]):
+        """Simpan banyak perubahan sekaligus (satu kali tulis)"""
+        self.simpan_semua(semua())
+    
+    def files(self) -> List[str]:
+        """File yang dipakai storage ini"""
+        return [self.filename]
+
+
+class JournalStorage(CsvStorage):
+    """Snapshot CSV + write-ahead log append-only.
+    
+    Setiap perubahan ditambahkan sebagai satu baris JSON ke ``<filename>.journal``
+    (O(1) I/O per klik). Setelah ``compact_every`` record, jurnal dipadatkan
+    menjadi snapshot CSV baru. Saat load, snapshot dibaca lalu jurnal di-replay.
+    """
+    
+    FORMAT = "CSV + journal (JSON Lines)"
+    
+    def __init__(self, filename: str, compact_every: int = 1000, fsync: bool = True):
+        super().__init__(filename)
+        self.journal_filename = filename + ".journal"
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self._record_count = 0
+    
+    def load(self) -> List[Barang]:
+        """Baca snapshot lalu replay jurnal di atasnya"""
+        items = {b.id: b for b in super().load()}
+        self._record_count = 0
+        if os.path.exists(self.journal_filename):
+            valid_bytes = 0
+            with open(self.journal_filename, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break  # record terakhir terpotong (crash saat append)
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        break
+                    valid_bytes += len(line)
+                    self._record_count += 1
+                    try:
+                        if record['op'] == 'u':
+                            barang = _barang_dari_row(dict(zip(FIELDNAMES, record['row'])))
+                            items[barang.id] = barang
+                        elif record['op'] == 'd':
+                            items.pop(record['id'], None)
+                    except (KeyError, TypeError, ValueError) as e:
+                        self.load_errors.append(f"Journal record {self._record_count}: {e!r}")
+            if valid_bytes < os.path.getsize(self.journal_filename):
+                # Buang ekor rusak supaya append berikutnya tetap terbaca
+                with open(self.journal_filename, 'r+b') as f:
+                    f.truncate(valid_bytes)
+        return list(items.values())
+    
+    def simpan_semua(self, barang_list: List[Barang]):
+        """Tulis snapshot secara atomik lalu kosongkan jurnal"""
+        tmp = self.filename + ".tmp"
+        with open(tmp, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+            writer.writeheader()
+            writer.writerows(asdict(b) for b in barang_list)
+            METRICS.catat_bytes("journal snapshot", f.tell())
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp, self.filename)
+        # Replay idempotent: crash sebelum truncate hanya mengulang record yang sama
+        open(self.journal_filename, 'w', encoding='utf-8').close()
+        self._record_count = 0
+    
+    def simpan_upsert(self, barang: Barang, semua: Callable[[], List[Barang]]):
+        """Append record upsert ke jurnal"""
+        self._append([self._record_upsert(barang)], semua)
+    
+    def simpan_hapus(self, barang_id: str, semua: Callable[[], List[Barang]]):
+        """Append record hapus ke jurnal"""
+        self._append([{'op': 'd', 'id': barang_id}], semua)
+    
+    def simpan_banyak(self, upserts: List[Barang], hapus: List[str],
+                      semua: Callable[[], List[Barang]]):
+        """Append semua record dengan satu fsync"""
+        records = [self._record_upsert(b) for b in upserts]
+        records += [{'op': 'd', 'id': barang_id} for barang_id in hapus]
+        self._append(records, semua)
+    
+    def files(self) -> List[str]:
+        return [self.filename, self.journal_filename]
+    
+    @staticmethod
+    def _record_upsert(barang: Barang) -> Dict:
+        row = [barang.id, barang.nama, barang.jumlah, barang.category,
+               barang.image_path, barang.created_at]
+        return {'op': 'u', 'row': row}
+    
+    def _append(self, records: List[Dict], semua: Callable[[], List[Barang]]):
+        if not records:
+            return
+        data = ''.join(json.dumps(r, ensure_ascii=False, separators=(',', ':')) + '\n'
+                       for r in records)
+        with open(self.journal_filename, 'a', encoding='utf-8') as f:
+            f.write(data)
+            if METRICS.enabled:
+                METRICS.catat_bytes("journal", len(data.encode('utf-8')))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self._record_count += len(records)
+        if self._record_count >= self.compact_every:
+            self.simpan_semua(semua())
+
+
+class SqliteStorage:
+    """Penyimpanan SQLite (WAL) dengan index pada id, nama dan category.
+    
+    Database disimpan di samping CSV (``inventory.csv`` -> ``inventory.db``).
+    Saat database baru dibuat dan CSV lama ada, isinya dimigrasikan otomatis.
+    Setiap perubahan adalah satu transaksi; ``simpan_banyak`` memakai satu
+    transaksi untuk seluruh batch.
+    """
+    
+    FORMAT = "SQLite (WAL)"
+    
+    _SQL_UPSERT = (
+        "INSERT INTO barang (id, nama, jumlah, category, image_path, created_at)"
+        " VALUES (?, ?, ?, ?, ?, ?)"
+        " ON CONFLICT(id) DO UPDATE SET nama = excluded.nama, jumlah = excluded.jumlah,"
+        " category = excluded.category, image_path = excluded.image_path,"
+        " created_at = excluded.created_at"
+    )
+    
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.load_errors: List[str] = []
+        self.db_filename = os.path.splitext(filename)[0] + ".db"
+        baru = not os.path.exists(self.db_filename)
+        self.conn = sqlite3.connect(self.db_filename, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS barang ("
+                " id TEXT PRIMARY KEY, nama TEXT NOT NULL, jumlah INTEGER NOT NULL,"
+                " category TEXT NOT NULL, image_path TEXT NOT NULL, created_at TEXT NOT NULL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_barang_nama ON barang (nama COLLATE NOCASE)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_barang_category ON barang (category)")
+        if baru and os.path.exists(filename):
+            self.impor_csv(filename)
+    
+    def impor_csv(self, csv_filename: str) -> int:
+        """Migrasi isi file CSV lama ke database; mengembalikan jumlah baris"""
+        csv_storage = CsvStorage(csv_filename)
+        barang_list = csv_storage.load()
+        self.load_errors = csv_storage.load_errors
+        with self.conn:
+            self.conn.executemany(self._SQL_UPSERT, [self._row(b) for b in barang_list])
+        return len(barang_list)
+    
+    def load(self) -> List[Barang]:
+        """Baca seluruh barang sesuai urutan insert"""
+        cursor = self.conn.execute(
+            "SELECT id, nama, jumlah, category, image_path, created_at FROM barang ORDER BY rowid"
+        )
+        return [Barang(*row) for row in cursor]
+    
+    def simpan_semua(self, barang_list: List[Barang]):
+        """Ganti seluruh isi tabel dalam satu transaksi"""
+        with self.conn:
+            self.conn.execute("DELETE FROM barang")
+            self.conn.executemany(self._SQL_UPSERT, [self._row(b) for b in barang_list])
+    
+    def simpan_upsert(self, barang: Barang, semua: Callable[[], List[Barang]]):
+        with self.conn:
+            self.conn.execute(self._SQL_UPSERT, self._row(barang))
+    
+    def simpan_hapus(self, barang_id: str, semua: Callable[[], List[Barang]]):
+        with self.conn:
+            self.conn.execute("DELETE FROM barang WHERE id = ?", (barang_id,))
+    
+    def simpan_banyak(self, upserts: List[Barang], hapus: List[str],
+                      semua: Callable[[], List[Barang]]):
+        with self.conn:
+            self.conn.executemany(self._SQL_UPSERT, [self._row(b) for b in upserts])
+            self.conn.executemany("DELETE FROM barang WHERE id = ?", [(i,) for i in hapus])
+    
+    def files(self) -> List[str]:
+        return [self.db_filename, self.db_filename + "-wal"]
+    
+    @staticmethod
+    def _row(barang: Barang) -> tuple:
+        return (barang.id, barang.nama, barang.jumlah, barang.category,
+                barang.image_path, barang.created_at)
+
+
+class WriteBehindStorage(CsvStorage):
+    """CSV dengan persistensi write-behind.
+    
+    Perubahan hanya menandai storage sebagai kotor; thread latar menulis satu
+    snapshot atomik (temp file + rename) setelah ``flush_ms`` milidetik atau
+    ``max_changes`` perubahan, mana yang lebih dulu. Klik beruntun digabung
+    menjadi satu tulis. Perubahan tertunda ditulis saat proses berhenti.
+    """
+    
+    FORMAT = "CSV (write-behind)"
+    
+    def __init__(self, filename: str, flush_ms: Optional[int] = None, max_changes: int = 200):
+        super().__init__(filename)
+        if flush_ms is None:
+            flush_ms = int(os.environ.get("STOCKIFY_FLUSH_MS", "500"))
+        self.flush_ms = flush_ms
+        self.max_changes = max_changes
+        self._cond = threading.Condition()
+        self._tulis_lock = threading.Lock()
+        self._dirty = 0
+        self._semua: Optional[Callable[[], List[Barang]]] = None
+        self._thread: Optional[threading.Thread] = None
+        atexit.register(self.flush)
+    
+    def simpan_semua(self, barang_list: List[Barang]):
+        """Tulis snapshot sekarang juga"""
+        self._tulis(barang_list)
+        if self._thread is not None:
+            # Flush latar yang sedang berjalan bisa menimpa dengan snapshot lebih
+            # lama; tandai kotor supaya flush berikutnya menulis keadaan terbaru
+            self._tandai(1, self._semua)
+    
+    def simpan_upsert(self, barang: Barang, semua: Callable[[], List[Barang]]):
+        self._tandai(1, semua)
+    
+    def simpan_hapus(self, barang_id: str, semua: Callable[[], List[Barang]]):
+        self._tandai(1, semua)
+    
+    def simpan_banyak(self, upserts: List[Barang], hapus: List[str],
+                      semua: Callable[[], List[Barang]]):
+        self._tandai(len(upserts) + len(hapus), semua)
+    
+    def pending(self) -> int:
+        """Jumlah perubahan yang belum ditulis ke disk"""
+        with self._cond:
+            return self._dirty
+    
+    def flush(self):
+        """Tulis perubahan tertunda sekarang juga"""
+        with self._cond:
+            dirty, semua = self._dirty, self._semua
+            self._dirty = 0
+        if not dirty or semua is None:
+            return
+        try:
+            # Snapshot diambil di luar _tulis_lock: semua() memakai lock repository
+            self._tulis(semua())
+        except Exception:
+            with self._cond:
+                self._dirty += dirty  # dicoba lagi pada flush berikutnya
+            raise
+    
+    def _tulis(self, barang_list: List[Barang]):
+        """Tulis snapshot secara atomik (temp file + rename)"""
+        with self._tulis_lock:
+            tmp = self.filename + ".tmp"
+            with open(tmp, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=FIELDNAMES)
+                writer.writeheader()
+                writer.writerows(asdict(b) for b in barang_list)
+                METRICS.catat_bytes("csv", f.tell())
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.filename)
+    
+    def _tandai(self, n: int, semua: Callable[[], List[Barang]]):
+        with self._cond:
+            self._dirty += n
+            self._semua = semua
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="stockify-flush", daemon=True)
+                self._thread.start()
+            self._cond.notify()
+    
+    def _loop(self):
+        while True:
+            with self._cond:
+                while not self._dirty:
+                    self._cond.wait()
+                # Kumpulkan perubahan sampai interval habis atau batas tercapai
+                batas = time.monotonic() + self.flush_ms / 1000
+                while self._dirty < self.max_changes:
+                    sisa = batas - time.monotonic()
+                    if sisa <= 0:
+                        break
+                    self._cond.wait(sisa)
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"Error flushing CSV: {e}")
+                time.sleep(self.flush_ms / 1000)
+
+
+STORAGE_MODES = {
+    "csv": CsvStorage,
+    "journal": JournalStorage,
+    "sqlite": SqliteStorage,
+    "writebehind": WriteBehindStorage,
+}
+
+# ======================
+# ID ALLOCATOR
+# ======================
+class IdAllocator:
+    """Alokator id monoton berbasis high-water mark.
+    
+    Id tidak pernah dipakai ulang walau barang dihapus atau aplikasi restart.
+    Id direservasi per blok (``block_size``) ke file ``.seq`` di bawah file lock,
+    jadi beberapa sesi yang berbagi satu CSV tidak saling bertabrakan dan
+    hanya menyentuh disk sekali per blok. Tanpa ``filename`` alokator hanya di memori.
+    """
+    
+    def __init__(self, filename: Optional[str] = None, block_size: int = 100):
+        self.filename = filename
+        self.block_size = block_size
+        self._next = 1
+        self._limit = 0  # id terakhir dalam blok yang sudah direservasi
+        self._hwm = 0    # high-water mark untuk mode tanpa file
+        self._lock = threading.Lock()
+    
+    def next_id(self) -> int:
+        """Ambil id berikutnya (O(1))"""
+        with self._lock:
+            if self._next > self._limit:
+                self._reserve_block()
+            value = self._next
+            self._next += 1
+            return value
+    
+    def observe(self, used_id) -> None:
+        """Catat id yang sudah ada supaya tidak dialokasikan lagi"""
+        try:
+            used_id = int(used_id)
+        except (TypeError, ValueError):
+            return
+        with self._lock:
+            if used_id >= self._next:
+                self._next = used_id + 1
+    
+    def _reserve_block(self):
+        if self.filename is None:
+            start = max(self._hwm, self._next - 1) + 1
+            self._hwm = start + self.block_size - 1
+        else:
+            with open(self.filename, 'a+', encoding='utf-8') as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                try:
+                    f.seek(0)
+                    content = f.read().strip()
+                    hwm = int(content) if content else 0
+                    start = max(hwm, self._next - 1) + 1
+                    f.seek(0)
+                    f.truncate()
+                    f.write(str(start + self.block_size - 1))
+                    f.flush()
+                    os.fsync(f.fileno())
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+        self._next = start
+        self._limit = start + self.block_size - 1
+
+# ======================
+# STOCK LEDGER
+# ======================
+class StockLedger:
+    """Ledger pergerakan stok append-only dengan rollup per jam dan per hari.
+    
+    Setiap record adalah satu baris ``epoch,id,delta`` di ``<filename>.ledger``.
+    Rollup di-update inkremental saat record dicatat, jadi laporan tidak perlu
+    memindai ledger mentah. Rollup disimpan berkala ke ``<filename>.ckpt``
+    beserta offset ledger-nya, sehingga startup hanya me-replay ekor ledger.
+    Stok keluar per barang hanya disimpan ``DAILY_RETENTION`` hari.
+    
+    Retensi ledger mentah: setelah checkpoint, ledger yang sudah tercakup
+    dipindah ke ``<filename>.ledger.1`` (menimpa segmen sebelumnya), jadi di
+    disk hanya ada paling banyak dua segmen sekitar ``CHECKPOINT_BYTES``.
+    """
+    
+    HOURLY_RETENTION = 14 * 24  # jam
+    DAILY_RETENTION = 90  # hari, untuk keluar per barang (days of cover)
+    CHECKPOINT_BYTES = 1024 * 1024  # checkpoint setelah ledger bertambah sebanyak ini
+    
+    def __init__(self, filename: Optional[str] = None):
+        self.filename = filename
+        self.checkpoint_filename = filename + ".ckpt" if filename else None
+        self.arsip_filename = filename + ".1" if filename else None
+        self.per_jam: Dict[str, List[int]] = {}               # "YYYY-MM-DD HH:00" -> [masuk, keluar]
+        self.keluar_hari: Dict[str, Dict[str, int]] = {}      # "YYYY-MM-DD" -> id -> keluar
+        self.total_hari: Dict[str, List[int]] = {}            # "YYYY-MM-DD" -> [masuk, keluar]
+        self._buffer: List[str] = []
+        # Byte ledger yang sudah masuk rollup; None jika proses lain ikut menulis (checkpoint dimatikan)
+        self._offset: Optional[int] = 0
+        self._sejak_checkpoint = 0
+        self._load()
+    
+    def catat(self, barang_id: str, delta: int, ts: Optional[float] = None):
+        """Catat satu pergerakan (ditulis ke file saat ``flush``)"""
+        ts = int(time.time() if ts is None else ts)
+        self._buffer.append(f"{ts},{barang_id},{delta}\n")
+        self._rollup(ts, barang_id, delta)
+    
+    def flush(self):
+        """Tulis record yang tertunda dengan satu append"""
+        if not self._buffer:
+            return
+        data = ''.join(self._buffer).encode('utf-8')
+        self._buffer = []
+        if self.filename is None:
+            return
+        with open(self.filename, 'ab') as f:
+            f.write(data)
+            akhir = f.tell()
+        if self._offset is not None and akhir - len(data) != self._offset:
+            self._offset = None  # ada penulis lain: record mereka tidak ada di rollup ini
+        if self._offset is None:
+            return
+        self._offset = akhir
+        self._sejak_checkpoint += len(data)
+        if self._sejak_checkpoint >= self.CHECKPOINT_BYTES:
+            self._checkpoint()
+    
+    def harian(self, days: int = 30) -> List[Tuple[str, int, int]]:
+        """(tanggal, masuk, keluar) untuk ``days`` hari terakhir"""
+        today = date.today()
+        hasil = []
+        for offset in range(days - 1, -1, -1):
+            key = (today - timedelta(days=offset)).isoformat()
+            masuk, keluar = self.total_hari.get(key, (0, 0))
+            hasil.append((key, masuk, keluar))
+        return hasil
+    
+    def per_jam_terakhir(self, hours: int = 48) -> List[Tuple[str, int, int]]:
+        """(jam, masuk, keluar) untuk ``hours`` jam terakhir"""
+        now = datetime.now().replace(minute=0, second=0, microsecond=0)
+        hasil = []
+        for offset in range(hours - 1, -1, -1):
+            key = (now - timedelta(hours=offset)).strftime("%Y-%m-%d %H:00")
+            masuk, keluar = self.per_jam.get(key, (0, 0))
+            hasil.append((key, masuk, keluar))
+        return hasil
+    
+    def keluar_per_barang(self, days: int = 30) -> Dict[str, int]:
+        """Total stok keluar per barang dalam ``days`` hari terakhir"""
+        today = date.today()
+        total: Dict[str, int] = {}
+        for offset in range(min(days, self.DAILY_RETENTION)):
+            for barang_id, keluar in self.keluar_hari.get((today - timedelta(days=offset)).isoformat(), {}).items():
+                total[barang_id] = total.get(barang_id, 0) + keluar
+        return total
+    
+    def _rollup(self, ts: int, barang_id: str, delta: int):
+        waktu = datetime.fromtimestamp(ts)
+        jam = waktu.strftime("%Y-%m-%d %H:00")
+        hari = jam[:10]
+        slot = 0 if delta > 0 else 1
+        amount = abs(delta)
+        
+        if jam not in self.per_jam and len(self.per_jam) >= self.HOURLY_RETENTION:
+            terlama = min(self.per_jam)
+            if jam > terlama:
+                del self.per_jam[terlama]
+        if jam in self.per_jam or len(self.per_jam) < self.HOURLY_RETENTION:
+            # Record lebih tua dari jendela per jam (jam mundur, banyak proses) hanya masuk rollup harian
+            self.per_jam.setdefault(jam, [0, 0])[slot] += amount
+        self.total_hari.setdefault(hari, [0, 0])[slot] += amount
+        if slot == 1:
+            per_barang = self.keluar_hari.get(hari)
+            if per_barang is None:
+                if hari < self._batas_hari():
+                    return
+                per_barang = self.keluar_hari[hari] = {}
+                self._pangkas()
+            per_barang[barang_id] = per_barang.get(barang_id, 0) + amount
+    
+    def _batas_hari(self) -> str:
+        return (date.today() - timedelta(days=self.DAILY_RETENTION)).isoformat()
+    
+    def _pangkas(self):
+        """Buang keluar per barang yang lebih tua dari DAILY_RETENTION"""
+        batas = self._batas_hari()
+        for hari in [h for h in self.keluar_hari if h < batas]:
+            del self.keluar_hari[hari]
+    
+    def _checkpoint(self):
+        """Simpan rollup + offset ledger secara atomik, lalu rotasi ledger yang sudah tercakup"""
+        self._pangkas()
+        if not self._tulis_checkpoint() or not os.path.exists(self.filename):
+            return
+        # Urutan ini aman terhadap crash: checkpoint di atas menunjuk ke isi
+        # ledger yang sekarang menjadi .1, dan _load mengenalinya di sana
+        try:
+            os.replace(self.filename, self.arsip_filename)
+        except OSError as e:
+            print(f"Error rotating ledger: {e}")
+            return
+        self._offset = 0
+        self._tulis_checkpoint()
+    
+    def _tulis_checkpoint(self) -> bool:
+        data = {"offset": self._offset, "head": self._kepala(self.filename), "per_jam": self.per_jam,
+                "keluar_hari": self.keluar_hari, "total_hari": self.total_hari}
+        tmp = self.checkpoint_filename + ".tmp"
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp, self.checkpoint_filename)
+            self._sejak_checkpoint = 0
+            return True
+        except OSError as e:
+            print(f"Error writing ledger checkpoint: {e}")
+            return False
+    
+    @staticmethod
+    def _kepala(path: str) -> str:
+        """Awal file ledger, untuk memastikan checkpoint milik ledger yang sama"""
+        try:
+            with open(path, 'rb') as f:
+                return f.read(64).decode('latin-1')
+        except FileNotFoundError:
+            return ""
+    
+    @classmethod
+    def _cocok(cls, ckpt: dict, path: str) -> bool:
+        """Apakah checkpoint dibuat untuk isi ``path`` (file yang belum ada = ledger kosong)"""
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        # head bisa lebih pendek dari 64 byte (ledger masih kecil/kosong saat checkpoint)
+        return ckpt["offset"] <= size and cls._kepala(path).startswith(ckpt["head"])
+    
+    def _load(self):
+        if self.filename is None:
+            return
+        # (file, offset) yang di-replay berurutan
+        segmen = [(self.arsip_filename, 0), (self.filename, 0)]
+        try:
+            with open(self.checkpoint_filename, encoding='utf-8') as f:
+                ckpt = json.load(f)
+            if self._cocok(ckpt, self.filename):
+                segmen = [(self.filename, ckpt["offset"])]
+            elif self._cocok(ckpt, self.arsip_filename):
+                # Crash di antara rotasi dan checkpoint berikutnya
+                segmen = [(self.arsip_filename, ckpt["offset"]), (self.filename, 0)]
+            else:
+                raise ValueError("checkpoint does not match ledger")
+            self.per_jam = ckpt["per_jam"]
+            self.keluar_hari = ckpt["keluar_hari"]
+            self.total_hari = ckpt["total_hari"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass  # tanpa checkpoint (atau rusak): replay segmen ledger yang tersisa
+        self._offset = 0
+        self._sejak_checkpoint = 0
+        for path, offset in segmen:
+            if not os.path.exists(path):
+                continue
+            with open(path, 'rb') as f:
+                f.seek(offset)
+                for line in f:
+                    try:
+                        ts, barang_id, delta = line.decode('utf-8').rstrip('\n').split(',')
+                        self._rollup(int(ts), barang_id, int(delta))
+                    except (ValueError, KeyError, OverflowError, OSError):
+                        continue  # baris rusak/terpotong atau timestamp di luar jangkauan
+                self._offset = f.tell()
+            self._sejak_checkpoint += self._offset - offset
+        if not os.path.exists(self.filename):
+            self._offset = 0
+        self._pangkas()
+        # Ledger besar dari versi tanpa rotasi juga langsung dirotasi
+        if self._sejak_checkpoint >= self.CHECKPOINT_BYTES or self._offset >= self.CHECKPOINT_BYTES \
+                or segmen[0][0] == self.arsip_filename:
+            self._checkpoint()
+
+# ======================
+# IMAGE STORE
+# ======================
+class ImageStore:
+    """Gambar barang content-addressed + thumbnail dengan cache LRU di disk.
+    
+    Gambar asli disimpan sebagai ``<directory>/<sha256>.<ext>`` (file yang sama
+    tidak pernah disimpan dua kali). Thumbnail dibuat di thread pool latar ke
+    ``<directory>/thumbs``; saat total ukurannya melewati ``max_thumb_bytes``,
+    thumbnail yang paling lama tidak dipakai (mtime) dihapus. PIL baru
+    di-import di worker. Hanya file di dalam ``directory`` yang mau dibaca.
+    """
+    
+    THUMB_FORMAT = "JPEG"
+    TOUCH_INTERVAL = 300  # detik; mtime thumbnail (urutan LRU) paling sering diperbarui sekali per interval
+    
+    def __init__(self, directory: str = "images", thumb_size: int = 96,
+                 max_thumb_bytes: int = 20 * 1024 * 1024, workers: int = 2):
+        self.directory = directory
+        self.thumb_dir = os.path.join(directory, "thumbs")
+        self.thumb_size = thumb_size
+        self.max_thumb_bytes = max_thumb_bytes
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, Future] = {}
+        self._gagal: Set[str] = set()  # thumbnail yang gagal dibuat (gambar rusak/tidak didukung)
+        self._kunci: Dict[Tuple[str, int, int], str] = {}  # (path, mtime, size) -> hash isi
+        self._total_thumb: Optional[int] = None
+        self._disentuh: Dict[str, float] = {}  # thumbnail -> waktu terakhir di-touch
+    
+    def milik(self, image_path: str) -> bool:
+        """Apakah ``image_path`` (setelah symlink di-resolve) berada di dalam direktori gambar"""
+        root = os.path.realpath(self.directory)
+        try:
+            return os.path.commonpath([root, os.path.realpath(image_path)]) == root
+        except ValueError:
+            return False  # drive berbeda (Windows)
+    
+    def simpan(self, data: bytes, filename: str) -> str:
+        """Simpan gambar (idempotent) dan jadwalkan thumbnail-nya; mengembalikan path"""
+        ext = os.path.splitext(filename)[1].lower() or ".img"
+        path = os.path.join(self.directory, hashlib.sha256(data).hexdigest() + ext)
+        if not os.path.exists(path):
+            os.makedirs(self.directory, exist_ok=True)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        self.thumbnail(path)
+        return path
+    
+    def thumbnail(self, image_path: str) -> Optional[str]:
+        """Path thumbnail jika sudah ada; jika belum, dibuat di latar dan None dikembalikan"""
+        if not image_path or not self.milik(image_path):
+            return None
+        try:
+            key = self._hash(image_path)
+        except OSError:
+            return None
+        thumb = os.path.join(self.thumb_dir, f"{key}_{self.thumb_size}.jpg")
+        if thumb in self._gagal:
+            return None
+        sekarang = time.time()
+        if sekarang - self._disentuh.get(thumb, 0.0) < self.TOUCH_INTERVAL:
+            return thumb
+        try:
+            os.utime(thumb)  # tandai baru dipakai (urutan LRU)
+            self._disentuh[thumb] = sekarang
+            return thumb
+        except FileNotFoundError:
+            pass
+        except OSError:
+            self._disentuh[thumb] = sekarang
+            return thumb  # ada tapi tidak bisa di-touch (mis. direktori read-only)
+        with self._lock:
+            if thumb not in self._pending:
+                if self._pool is None:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix="stockify-thumb")
+                self._pending[thumb] = self._pool.submit(self._buat, image_path, thumb)
+        return None
+    
+    def thumbnail_data_uri(self, image_path: str) -> Optional[str]:
+        """Thumbnail sebagai data URI kecil untuk disisipkan di kartu HTML"""
+        thumb = self.thumbnail(image_path)
+        if thumb is None:
+            return None
+        try:
+            return _data_uri(thumb, os.stat(thumb).st_size)
+        except FileNotFoundError:
+            self._disentuh.pop(thumb, None)  # dihapus sejak touch terakhir (mis. oleh proses lain)
+            return None
+    
+    def tunggu(self):
+        """Tunggu semua thumbnail yang sedang dibuat"""
+        with self._lock:
+            pending = list(self._pending.values())
+        for future in pending:
+            future.exception()
+    
+    def _hash(self, image_path: str) -> str:
+        nama = os.path.splitext(os.path.basename(image_path))[0]
+        if len(nama) == 64 and os.path.dirname(os.path.abspath(image_path)) == os.path.abspath(self.directory):
+            return nama  # sudah content-addressed
+        info = os.stat(image_path)
+        key = (image_path, info.st_mtime_ns, info.st_size)
+        if key not in self._kunci:
+            h = hashlib.sha256()
+            with open(image_path, 'rb') as f:
+                for blok in iter(lambda: f.read(1 << 20), b''):
+                    h.update(blok)
+            self._kunci[key] = h.hexdigest()
+        return self._kunci[key]
+    
+    def _buat(self, image_path: str, thumb: str):
+        try:
+            from PIL import Image, ImageOps
+    
+            with Image.open(image_path) as img:
+                img = ImageOps.exif_transpose(img)
+                img.thumbnail((self.thumb_size, self.thumb_size))
+                if img.mode != "RGB":
+                    latar = Image.new("RGB", img.size, "white")
+                    latar.paste(img, mask=img.convert("RGBA").split()[-1])
+                    img = latar
+                os.makedirs(self.thumb_dir, exist_ok=True)
+                tmp = thumb + ".tmp"
+                img.save(tmp, self.THUMB_FORMAT, quality=80, optimize=True)
+            os.replace(tmp, thumb)
+            self._evict(os.path.getsize(thumb))
+        except Exception as e:
+            print(f"Error creating thumbnail for {image_path}: {e}")
+            with self._lock:
+                self._gagal.add(thumb)  # jangan dijadwalkan ulang tiap rerun
+        finally:
+            with self._lock:
+                self._pending.pop(thumb, None)
+    
+    def _evict(self, tambahan: int):
+        with self._lock:
+            if self._total_thumb is None:
+                self._total_thumb = sum(e.stat().st_size for e in os.scandir(self.thumb_dir)
+                                        if e.name.endswith(".jpg"))
+            else:
+                self._total_thumb += tambahan
+            if self._total_thumb <= self.max_thumb_bytes:
+                return
+            files = sorted((e.stat().st_mtime, e.stat().st_size, e.path)
+                           for e in os.scandir(self.thumb_dir) if e.name.endswith(".jpg"))
+            for _, size, path in files:
+                if self._total_thumb <= self.max_thumb_bytes * 0.8:
+                    break
+                try:
+                    os.remove(path)
+                    self._total_thumb -= size
+                except FileNotFoundError:
+                    pass
+                self._disentuh.pop(path, None)
+
+
+@functools.lru_cache(maxsize=1024)
+def _data_uri(thumb: str, size: int) -> str:
+    """Isi thumbnail base64 (di-cache per path + ukuran file)"""
+    with open(thumb, 'rb') as f:
+        return "data:image/jpeg;base64," + base64.b64encode(f.read()).decode("ascii")
+
 # ======================
 # REPOSITORY LAYER
 # ======================
+def _terkunci(method):
+    """Jalankan method repository di bawah lock struktur (RLock)"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class InventoryRepository:
-    """Repository untuk mengelola data barang dengan CSV"""
+    """Repository untuk mengelola data barang dengan CSV.
+    
+    Aman dipakai bersama oleh banyak sesi/thread. Struktur bersama (index,
+    stats, search index, storage) dijaga satu RLock; read-modify-write
+    stok per barang dijaga lock bergaris (``lock_barang``) sehingga klik pada
+    barang berbeda tidak saling menunggu. Urutan lock selalu barang -> struktur.
+    """
+    
+    LOCK_STRIPES = 64
     
-    def __init__(self, filename: str = "inventory.csv"):
+    def __init__(self, filename: str = "inventory.csv", storage_mode: str = "csv"):
         self.filename = filename
-        self.barang_list: List[Barang] = []
+        self._lock = threading.RLock()
+        self._item_locks = [threading.Lock() for _ in range(self.LOCK_STRIPES)]
+        # Naik setiap ada perubahan; dipakai sesi lain untuk mendeteksi data baru
+        self.versi = 0
+        self._listeners: List[Callable[[int], None]] = []
+        self.storage = STORAGE_MODES[storage_mode](filename)
+        # Index id -> Barang; dict menjaga urutan insert sehingga sekaligus jadi storage utama
+        self._index: Dict[str, Barang] = {}
+        self.id_allocator = IdAllocator(filename + ".seq")
+        self.stats = StockStats()
+        # (jumlah, category) yang sudah dihitung ke stats, per id
+        self._tercatat: Dict[str, tuple] = {}
+        self.search_index = SearchIndex({"nama": 1.0, "category": 0.5})
+        self.stok_index = StockIndex()
+        self.ledger = StockLedger(filename + ".ledger")
+        self.views = ViewCache()
+        self._search_siap = False  # index dibangun saat pencarian pertama
+        self._stok_siap = False  # index stok dibangun saat query ambang pertama
+        self.load_errors: List[str] = []  # baris/record yang dilewati saat load terakhir
+        self.load_backups: List[str] = []  # salinan file asli bila load terakhir bermasalah
         self._load_from_csv()
     
+    @diukur
+    @_terkunci
+    def create_banyak(self, rows: List[Tuple[str, int, str, str]]) -> List[Barang]:
+        """Buat banyak barang (nama, jumlah, category, image_path) dengan satu kali persist"""
+        created_at = datetime.now().strftime("%Y-%m-%d %H:%M")
+        baru = []
+        for nama, jumlah, category, image_path in rows:
+            barang = Barang(
+                id=str(self.id_allocator.next_id()),
+                nama=nama,
+                jumlah=jumlah,
+                category=category,
+                image_path=image_path,
+                created_at=created_at
+            )
+            self._index[barang.id] = barang
+            self._sinkron_index(barang)
+            baru.append(barang)
+        if baru:
+            self.storage.simpan_banyak(baru, [], self.get_all)
+            self._ubah_versi()
+        return baru
+    
+    def lock_barang(self, barang_id: str) -> threading.Lock:
+        """Lock untuk read-modify-write satu barang"""
+        return self._item_locks[hash(barang_id) % self.LOCK_STRIPES]
+    
+    @contextmanager
+    def lock_banyak(self, barang_ids: Iterable[str]):
+        """Kunci banyak barang sekaligus (urutan stripe tetap, bebas deadlock)"""
+        stripes = sorted({hash(i) % self.LOCK_STRIPES for i in barang_ids})
+        with ExitStack() as stack:
+            for stripe in stripes:
+                stack.enter_context(self._item_locks[stripe])
+            yield
+    
+    @diukur
+    def ubah_stok_banyak(self, movements: List[Tuple[str, int]]) -> List[str]:
+        """Terapkan banyak pergerakan stok secara atomik dengan satu persist.
+        
+        Pergerakan divalidasi berurutan dengan aturan yang sama seperti
+        ``Barang.kurangi_stok`` (stok tidak boleh negatif). Jika ada satu baris
+        gagal, tidak ada yang diterapkan dan daftar error dikembalikan. Jika
+        persist gagal, semua perubahan di memori dikembalikan.
+        """
+        with self.lock_banyak(barang_id for barang_id, _ in movements), self._lock:
+            saldo, errors = self._validasi_pergerakan(movements)
+            if errors or not saldo:
+                return [f"Line {i + 1}: {pesan}" for i, pesan in errors.items()]
+            self._terapkan_saldo(saldo)
+            return []
+    
+    @diukur
+    def ubah_stok_sebagian(self, movements: List[Tuple[str, int]]) -> Dict[int, str]:
+        """Seperti ``ubah_stok_banyak`` tetapi baris yang valid tetap diterapkan.
+        
+        Baris yang gagal dilewati (tidak memengaruhi saldo baris berikutnya).
+        Mengembalikan {index baris (mulai 0): pesan error}.
+        """
+        with self.lock_banyak(barang_id for barang_id, _ in movements), self._lock:
+            saldo, errors = self._validasi_pergerakan(movements)
+            if saldo:
+                self._terapkan_saldo(saldo)
+            return errors
+    
+    def _validasi_pergerakan(self, movements: List[Tuple[str, int]]) -> Tuple[Dict[str, int], Dict[int, str]]:
+        """Saldo akhir per barang untuk baris yang valid + error per index baris"""
+        errors: Dict[int, str] = {}
+        saldo: Dict[str, int] = {}
+        for i, (barang_id, delta) in enumerate(movements):
+            barang = self._index.get(barang_id)
+            if barang is None:
+                errors[i] = f"item {barang_id!r} not found"
+                continue
+            jumlah = saldo.get(barang_id, barang.jumlah) + delta
+            if jumlah < 0:
+                errors[i] = f"stock of {barang.nama!r} would drop below 0"
+                continue
+            saldo[barang_id] = jumlah
+        return saldo, errors
+    
+    def _terapkan_saldo(self, saldo: Dict[str, int]):
+        """Set jumlah akhir dan persist sekali; dikembalikan jika persist gagal"""
+        lama = {barang_id: self._index[barang_id].jumlah for barang_id in saldo}
+        berubah = []
+        for barang_id, jumlah in saldo.items():
+            barang = self._index[barang_id]
+            barang.set_jumlah(jumlah)
+            self._sinkron_index(barang)
+            berubah.append(barang)
+        try:
+            self.storage.simpan_banyak(berubah, [], self.get_all)
+        except Exception:
+            for barang in berubah:
+                barang.set_jumlah(lama[barang.id])
+                self._sinkron_index(barang)  # ledger mencatat pembalikannya
+            self.ledger.flush()
+            raise
+        self._ubah_versi()
+    
+    def subscribe(self, callback: Callable[[int], None]):
+        """Daftarkan callback yang dipanggil dengan versi baru setiap ada perubahan"""
+        with self._lock:
+            self._listeners.append(callback)
+    
+    def unsubscribe(self, callback: Callable[[int], None]):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+    
+    @diukur
+    @_terkunci
     def create_barang(self, nama: str, jumlah: int, category: str, image_path: str = "") -> Barang:
         """Buat barang baru"""
         barang = Barang(
-            id=str(len(self.barang_list) + 1),
+            id=str(self.id_allocator.next_id()),
             nama=nama,
             jumlah=jumlah,
             category=category,
             image_path=image_path,
             created_at=datetime.now().strftime("%Y-%m-%d %H:%M")
         )
-        self.barang_list.append(barang)
-        self._save_to_csv()
+        self._index[barang.id] = barang
+        self._simpan_perubahan(barang)
         return barang
     
+    @diukur
+    @_terkunci
     def get_all(self) -> List[Barang]:
         """Dapatkan semua barang"""
-        return self.barang_list
+        return list(self._index.values())
+    
+    def get_by_id(self, barang_id: str) -> Optional[Barang]:
+        """Cari barang berdasarkan id (O(1))"""
+        return self._index.get(barang_id)
+    
+    @diukur
+    @_terkunci
+    def get_terbaru(self, n: int) -> List[Barang]:
+        """Dapatkan n barang terakhir ditambahkan"""
+        return list(islice(reversed(self._index.values()), n))[::-1]
+    
+    def count(self) -> int:
+        """Jumlah jenis barang"""
+        return len(self._index)
+    
+    @diukur
+    @_terkunci
+    def query(self, search: str = "", category: Optional[str] = None,
+              sort_by: Optional[str] = None, descending: bool = False,
+              offset: int = 0, limit: Optional[int] = None) -> Tuple[int, List[Barang]]:
+        """Filter, sort dan paginasi di repository.
+        
+        Mengembalikan (total hasil, barang di halaman). Sort memakai heap
+        parsial (O(N log k)) bila ``limit`` diisi, bukan sort penuh.
+        """
+        if not search and category is None and sort_by is None:
+            # Jalur cepat: cukup iterasi sampai halaman yang diminta
+            end = None if limit is None else offset + limit
+            return len(self._index), list(islice(self._index.values(), offset, end))
+        
+        items = self.cari(search) if search else self._index.values()
+        if category is not None:
+            items = [b for b in items if b.category == category]
+        elif not isinstance(items, list):
+            items = list(items)
+        total = len(items)
+        
+        if sort_by is not None:
+            key = attrgetter(sort_by)
+            if limit is not None:
+                pick = heapq.nlargest if descending else heapq.nsmallest
+                items = pick(offset + limit, items, key=key)
+            else:
+                items = sorted(items, key=key, reverse=descending)
+        end = None if limit is None else offset + limit
+        return total, items[offset:end]
     
+    @diukur
+    @_terkunci
     def get_by_nama(self, nama: str) -> List[Barang]:
         """Cari barang berdasarkan nama"""
-        return [b for b in self.barang_list if nama.lower() in b.nama.lower()]
-    
+        if not nama.strip():
+            return self.get_all()
+        self._pastikan_search_index()
+        return [self._index[i] for i in self.search_index.cari(nama, fields=["nama"])]
+    
+    @diukur
+    @_terkunci
+    def cari(self, query: str, limit: Optional[int] = None) -> List[Barang]:
+        """Cari barang berdasarkan nama dan kategori, urut berdasarkan relevansi"""
+        self._pastikan_search_index()
+        return [self._index[i] for i in self.search_index.cari(query, limit=limit)]
+    
+    @diukur
     def update_barang(self, barang_id: str, **kwargs) -> bool:
         """Update data barang"""
-        for barang in self.barang_list:
-            if barang.id == barang_id:
-                for key, val in kwargs.items():
-                    setattr(barang, key, val)
-                self._save_to_csv()
-                return True
-        return False
+        with self.lock_barang(barang_id), self._lock:
+            barang = self._index.get(barang_id)
+            if barang is None:
+                return False
+            for key, val in kwargs.items():
+                setattr(barang, key, val)
+            self._simpan_perubahan(barang)
+            return True
     
+    @diukur
     def delete_barang(self, barang_id: str) -> bool:
         """Hapus barang"""
-        initial_length = len(self.barang_list)
-        self.barang_list = [b for b in self.barang_list if b.id != barang_id]
-        if len(self.barang_list) < initial_length:
-            self._save_to_csv()
+        with self.lock_barang(barang_id), self._lock:
+            if self._index.pop(barang_id, None) is None:
+                return False
+            self.stats.kurang(*self._tercatat.pop(barang_id))
+            self.search_index.hapus(barang_id)
+            self.stok_index.hapus(barang_id)
+            self.storage.simpan_hapus(barang_id, self.get_all)
+            self._ubah_versi()
             return True
-        return False
     
-    def _save_to_csv(self):
-        """Simpan data ke CSV"""
-        if not self.barang_list:
-            with open(self.filename, 'w', newline='', encoding='utf-8') as f:
-                fieldnames = ['id', 'nama', 'jumlah', 'category', 'image_path', 'created_at']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
+    @diukur
+    @_terkunci
+    def clear_all(self):
+        """Hapus semua barang"""
+        self._set_items([])
+        self._save_to_csv()
+        self._ubah_versi()
+    
+    @diukur
+    @_terkunci
+    def get_stats(self) -> Dict:
+        """Snapshot statistik yang konsisten"""
+        return self.stats.as_dict()
+    
+    @diukur
+    @_terkunci
+    def get_stok_di_bawah(self, batas: int, category: Optional[str] = None,
+                          minimal: Optional[int] = None) -> List[Barang]:
+        """Barang dengan minimal <= jumlah <= batas (opsional per kategori), stok terkecil dulu"""
+        self._pastikan_stok_index()
+        return [self._index[i] for i in self.stok_index.di_bawah(batas, category, minimal)]
+    
+    @_terkunci
+    def get_categories(self) -> List[str]:
+        """Daftar kategori yang sedang dipakai"""
+        return sorted(self.stats.per_category)
+    
+    @_terkunci
+    def view(self, key, builder: Callable[[], object], tag=None):
+        """Nilai turunan yang dibangun ulang hanya saat data (atau ``tag``) berubah"""
+        return self.views.get(key, self.versi, builder, tag)
+    
+    @diukur
+    @_terkunci
+    def get_top_items(self, n: int = 10) -> List[Tuple[str, int]]:
+        """n barang dengan stok terbanyak (di-cache per versi)"""
+        return self.view("top_items", lambda: [(b.nama, b.jumlah) for b in
+                                               heapq.nlargest(n, self._index.values(), key=attrgetter('jumlah'))],
+                         tag=n)
+    
+    @diukur
+    @_terkunci
+    def get_pergerakan(self, hourly: bool = False) -> List[Tuple[str, int, int]]:
+        """Rollup pergerakan stok: 48 jam terakhir atau 30 hari terakhir"""
+        if hourly:
+            return self.view("per_jam", self.ledger.per_jam_terakhir,
+                             tag=datetime.now().strftime("%Y-%m-%d %H"))
+        return self.view("harian", self.ledger.harian, tag=date.today())
+    
+    @diukur
+    @_terkunci
+    def get_days_of_cover(self, days: int = 30, limit: int = 10) -> List[Tuple[Barang, float]]:
+        """Barang dengan sisa hari stok paling sedikit, dari rata-rata keluar harian"""
+        return self.view("days_of_cover", lambda: self._hitung_days_of_cover(days, limit),
+                         tag=(date.today(), days, limit))
+    
+    def _hitung_days_of_cover(self, days: int, limit: int) -> List[Tuple[Barang, float]]:
+        cover = []
+        for barang_id, keluar in self.ledger.keluar_per_barang(days).items():
+            barang = self._index.get(barang_id)
+            if barang is not None:
+                cover.append((barang.jumlah / (keluar / days), barang_id))
+        return [(self._index[i], hari) for hari, i in heapq.nsmallest(limit, cover)]
+    
+    @diukur
+    @_terkunci
+    def to_frame(self, columns: Optional[List[str]] = None) -> "pd.DataFrame":
+        """DataFrame lewat snapshot kolomar (di-cache per versi; jangan diubah in-place)"""
+        return self.view(("frame", tuple(columns or FIELDNAMES)),
+                         lambda: KolomStore.dari(self._index.values()).to_frame(columns))
+    
+    def _set_items(self, barang_list: List[Barang]):
+        """Ganti seluruh isi repository dan bangun ulang index"""
+        self._index = {b.id: b for b in barang_list}
+        barang_list = list(self._index.values())  # id ganda: yang terakhir dipakai
+        self.views.clear()
+        self._hitung_ulang_stats()
+        self.stok_index.clear()
+        self._stok_siap = False
+        self.search_index.clear()
+        self._search_siap = False
+        numeric_ids = [int(i) for i in self._index if i.isdigit()]
+        if numeric_ids:
+            self.id_allocator.observe(max(numeric_ids))
+    
+    def _hitung_ulang_stats(self):
+        """Hitung ulang statistik dari nol (saat load), per kombinasi (jumlah, category) unik"""
+        self.stats = StockStats()
+        self._tercatat = {b.id: (b.jumlah, b.category) for b in self._index.values()}
+        for (jumlah, category), n in Counter(self._tercatat.values()).items():
+            self.stats._ubah(jumlah, category, n)
+    
+    def _catat_stats(self, barang: Barang):
+        """Sinkronkan stats dengan nilai barang saat ini"""
+        lama = self._tercatat.get(barang.id)
+        if lama is not None:
+            self.stats.kurang(*lama)
+        baru = (barang.jumlah, barang.category)
+        self.stats.tambah(*baru)
+        self._tercatat[barang.id] = baru
+    
+    @diukur
+    @_terkunci
+    def _pastikan_search_index(self):
+        """Bangun search index sekali; setelah itu di-update inkremental"""
+        if self._search_siap:
             return
-        
-        with open(self.filename, 'w', newline='', encoding='utf-8') as f:
-            data = [asdict(b) for b in self.barang_list]
-            fieldnames = data[0].keys()
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(data)
-    
-    def _load_from_csv(self):
-        """Load data dari CSV"""
-        if os.path.exists(self.filename):
+        for barang in self._index.values():
+            self.search_index.tambah(barang.id, {"nama": barang.nama, "category": barang.category})
+        self._search_siap = True
+    
+    @diukur
+    @_terkunci
+    def _pastikan_stok_index(self):
+        """Bangun index stok sekali (bulk); setelah itu di-update inkremental"""
+        if self._stok_siap:
+            return
+        self.stok_index.bangun((b.id, b.jumlah, b.category) for b in self._index.values())
+        self._stok_siap = True
+    
+    def _ubah_versi(self):
+        """Naikkan versi data dan beri tahu listener"""
+        self.ledger.flush()
+        self.versi += 1
+        for callback in list(self._listeners):
             try:
-                with open(self.filename, 'r', newline='', encoding='utf-8') as f:
-                    reader = csv.DictReader(f)
-                    self.barang_list = []
-                    
-                    for row in reader:
-                        row['jumlah'] = int(row['jumlah'])
-                        self.barang_list.append(Barang(**row))
+                callback(self.versi)
             except Exception as e:
-                self.barang_list = []
-                print(f"Error loading CSV: {e}")
+                print(f"Error in repository listener: {e}")
+    
+    @diukur
+    @_terkunci
+    def _simpan_perubahan(self, barang: Barang):
+        """Persist satu barang yang baru dibuat/diubah"""
+        if self._index.get(barang.id) is not barang:
+            return  # sudah dihapus sesi lain
+        self._sinkron_index(barang)
+        self.storage.simpan_upsert(barang, self.get_all)
+        self._ubah_versi()
+    
+    def _sinkron_index(self, barang: Barang):
+        """Sinkronkan stats, search index dan ledger dengan nilai barang saat ini"""
+        lama = self._tercatat.get(barang.id)
+        delta = barang.jumlah - (lama[0] if lama is not None else 0)
+        if delta:
+            self.ledger.catat(barang.id, delta)
+        self._catat_stats(barang)
+        if self._stok_siap:
+            self.stok_index.tambah(barang.id, barang.jumlah, barang.category)
+        if self._search_siap:
+            self.search_index.tambah(barang.id, {"nama": barang.nama, "category": barang.category})
+    
+    @diukur
+    @_terkunci
+    def _save_to_csv(self):
+        """Simpan seluruh data ke CSV (snapshot penuh)"""
+        self.storage.simpan_semua(self.get_all())
+    
+    @diukur
+    @_terkunci
+    def _load_from_csv(self):
+        """Load data dari CSV (dan jurnal, jika ada).
+        
+        Baris tidak valid dilewati dan dicatat di ``load_errors``. Setiap kali
+        ada masalah (sebagian baris atau seluruh file), salinan file aslinya
+        diamankan dulu supaya simpan berikutnya tidak membuang baris tersebut.
+        """
+        self.load_backups = []
+        try:
+            self._set_items(self.storage.load())
+            self.load_errors = list(self.storage.load_errors)
+        except Exception as e:
+            self._set_items([])
+            self.load_errors = [f"Could not load {self.filename}: {e}"]
+        if self.load_errors:
+            self.load_backups = self._amankan_file_rusak()
+            print(f"Loading {self.filename}: {len(self.load_errors)} problem(s), first: {self.load_errors[0]}")
+    
+    def _amankan_file_rusak(self) -> List[str]:
+        """Salin file storage yang gagal dibaca ke ``<file>.corrupt-<waktu>``"""
+        stempel = datetime.now().strftime("%Y%m%d-%H%M%S")
+        cadangan = []
+        for path in self.storage.files():
+            if os.path.exists(path):
+                try:
+                    shutil.copy2(path, f"{path}.corrupt-{stempel}")
+                    cadangan.append(f"{path}.corrupt-{stempel}")
+                except OSError as e:
+                    print(f"Error backing up {path}: {e}")
+        return cadangan
 
 # ======================
 # MANAGER LAYER
 # ======================
+@dataclass
+class ImportReport:
+    """Hasil impor massal"""
+    total_rows: int = 0
+    imported: int = 0
+    errors: List[str] = field(default_factory=list)
+
+
+@dataclass
+class BatchResult:
+    """Hasil batch pergerakan stok"""
+    ok: bool
+    applied: int
+    errors: List[str] = field(default_factory=list)
+
+
+def _baca_chunk(file: BinaryIO, file_format: str, chunk_size: int) -> Iterator[Tuple[List[Dict], float]]:
+    """Baca file per chunk; menghasilkan (list record, fraksi file yang sudah dibaca)"""
+    if file_format == "parquet":
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet import requires pyarrow (pip install pyarrow)")
+        parquet = pq.ParquetFile(file)
+        total = parquet.metadata.num_rows or 1
+        done = 0
+        for batch in parquet.iter_batches(batch_size=chunk_size):
+            records = batch.to_pylist()
+            done += len(records)
+            yield records, done / total
+        return
+    
+    file.seek(0, os.SEEK_END)
+    size = file.tell() or 1
+    file.seek(0)
+    text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    try:
+        reader = csv.DictReader(text)
+        while True:
+            records = list(islice(reader, chunk_size))
+            if not records:
+                break
+            yield records, min(file.tell() / size, 1.0)
+    finally:
+        text.detach()  # jangan tutup file milik pemanggil
+
+
+def _validasi_impor(record: Dict) -> Tuple[str, int, str, str]:
+    """Validasi satu baris impor menjadi (nama, jumlah, category, image_path)"""
+    nama = str(record.get('nama') or "").strip()
+    if not nama:
+        raise ValueError("'nama' is required")
+    try:
+        jumlah = int(record.get('jumlah'))
+    except (TypeError, ValueError):
+        raise ValueError(f"invalid 'jumlah': {record.get('jumlah')!r}")
+    if jumlah < 0:
+        raise ValueError("'jumlah' cannot be negative")
+    category = str(record.get('category') or "Other").strip()
+    image_path = str(record.get('image_path') or "")
+    return nama, jumlah, category, image_path
+
 class StockManager:
     """Manager untuk mengelola operasi stok"""
     
-    def __init__(self, inventory_repo: InventoryRepository):
+    def __init__(self, inventory_repo: InventoryRepository, image_store: Optional[ImageStore] = None):
         self.inventory_repo = inventory_repo
+        self.image_store = image_store or ImageStore()
     
+    @diukur
     def tambah_barang(self, nama: str, jumlah: int, category: str, image_path: str = "") -> Barang:
         """Tambah barang baru ke inventory"""
+        self._periksa_gambar(image_path)
         return self.inventory_repo.create_barang(nama, jumlah, category, image_path)
     
+    def _periksa_gambar(self, image_path: str):
+        """Tolak image_path di luar direktori gambar (impor/API tidak boleh membaca file server lain)"""
+        if image_path and not self.image_store.milik(image_path):
+            raise ValueError(f"'image_path' must be inside {self.image_store.directory!r}")
+    
+    @diukur
+    def simpan_gambar(self, data: bytes, filename: str) -> str:
+        """Simpan gambar barang; path-nya dipakai sebagai image_path"""
+        return self.image_store.simpan(data, filename)
+    
+    @diukur
+    def ganti_gambar(self, barang_id: str, data: bytes, filename: str) -> bool:
+        """Simpan gambar baru dan pasang ke barang"""
+        return self.inventory_repo.update_barang(barang_id, image_path=self.simpan_gambar(data, filename))
+    
+    @diukur
     def tambah_stok(self, barang_id: str, amount: int) -> bool:
         """Tambah stok barang yang sudah ada"""
-        for barang in self.inventory_repo.get_all():
-            if barang.id == barang_id:
-                barang.tambah_stok(amount)
-                self.inventory_repo._save_to_csv()
-                return True
-        return False
+        with self.inventory_repo.lock_barang(barang_id):
+            barang = self.inventory_repo.get_by_id(barang_id)
+            if barang is None:
+                return False
+            barang.tambah_stok(amount)
+            self.inventory_repo._simpan_perubahan(barang)
+            return True
     
+    @diukur
     def kurangi_stok(self, barang_id: str, amount: int) -> bool:
         """Kurangi stok barang"""
-        for barang in self.inventory_repo.get_all():
-            if barang.id == barang_id:
-                if barang.kurangi_stok(amount):
-                    self.inventory_repo._save_to_csv()
-                    return True
+        with self.inventory_repo.lock_barang(barang_id):
+            barang = self.inventory_repo.get_by_id(barang_id)
+            if barang is None or not barang.kurangi_stok(amount):
                 return False
-        return False
+            self.inventory_repo._simpan_perubahan(barang)
+            return True
     
     def cek_stok(self, barang_id: str) -> Optional[int]:
         """Cek jumlah stok barang"""
-        for barang in self.inventory_repo.get_all():
-            if barang.id == barang_id:
-                return barang.get_jumlah()
-        return None
+        barang = self.inventory_repo.get_by_id(barang_id)
+        return barang.get_jumlah() if barang is not None else None
     
-    def laporang_stok(self) -> Dict:
-        """Buat laporan statistik stok"""
+    @diukur
+    def impor_massal(self, file: BinaryIO, file_format: str = "csv", chunk_size: int = 5000,
+                     progress: Optional[Callable[[int, float], None]] = None) -> ImportReport:
+        """Impor banyak barang dari CSV/Parquet secara streaming.
+        
+        File dibaca per chunk dan divalidasi per baris; baris yang valid
+        diterapkan sekaligus dengan satu kali persist. ``progress`` dipanggil
+        per chunk dengan (baris diproses, fraksi 0..1).
+        """
+        report = ImportReport()
+        rows = []
+        for chunk, fraction in _baca_chunk(file, file_format, chunk_size):
+            for record in chunk:
+                report.total_rows += 1
+                try:
+                    row = _validasi_impor(record)
+                    self._periksa_gambar(row[3])
+                    rows.append(row)
+                except ValueError as e:
+                    report.errors.append(f"Row {report.total_rows}: {e}")
+            if progress is not None:
+                progress(report.total_rows, fraction)
+        report.imported = len(self.inventory_repo.create_banyak(rows))
+        return report
+    
+    def ekspor_csv(self, chunk_size: int = 5000) -> Iterator[str]:
+        """Ekspor seluruh barang sebagai potongan teks CSV (streaming)"""
         barang_list = self.inventory_repo.get_all()
-        return {
-            "total_items": len(barang_list),
-            "total_quantity": sum(b.jumlah for b in barang_list),
-            "low_stock": len([b for b in barang_list if 0 < b.jumlah <= 5]),
-            "out_of_stock": len([b for b in barang_list if b.jumlah == 0])
-        }
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(FIELDNAMES)
+        for start in range(0, len(barang_list), chunk_size):
+            writer.writerows(
+                (b.id, b.nama, b.jumlah, b.category, b.image_path, b.created_at)
+                for b in barang_list[start:start + chunk_size]
+            )
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+    
+    @diukur
+    def ekspor_csv_file(self) -> BinaryIO:
+        """Tulis ekspor ke file sementara (tumpah ke disk bila besar) dan kembalikan filenya"""
+        f = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+        for chunk in self.ekspor_csv():
+            f.write(chunk.encode('utf-8'))
+        f.seek(0)
+        return f
+    
+    @diukur
+    def proses_batch(self, movements: List[Tuple[str, int]]) -> BatchResult:
+        """Proses banyak pergerakan stok (id, delta) sekaligus; semua atau tidak sama sekali"""
+        errors = self.inventory_repo.ubah_stok_banyak(movements)
+        return BatchResult(ok=not errors, applied=0 if errors else len(movements), errors=errors)
+    
+    @diukur
+    def proses_sebagian(self, movements: List[Tuple[str, int]]) -> Dict[int, str]:
+        """Proses pergerakan stok; baris valid diterapkan, error per index baris"""
+        return self.inventory_repo.ubah_stok_sebagian(movements)
+    
+    @diukur
+    def laporang_stok(self) -> Dict:
+        """Buat laporan statistik stok (O(1), dari counter inkremental)"""
+        return self.inventory_repo.get_stats()
 
 # ======================
 # UI STYLING
 # ======================
+STYLES = """
+<style>
+@import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
+
+* {
+    font-family: 'Inter', sans-serif;
+}
+
+/* Sidebar */
+[data-testid="stSidebar"] {
+    background: linear-gradient(180deg, #1e3a8a 0%, #3b82f6 100%);
+}
+
+[data-testid="stSidebar"] h1 {
+    color: white !important;
+    font-size: 28px;
+    font-weight: 700;
+    text-align: center;
+    margin-bottom: 10px;
+}
+
+[data-testid="stSidebar"] p {
+    color: rgba(255,255,255,0.8);
+    text-align: center;
+    font-size: 14px;
+}
+
+/* Radio buttons di sidebar */
+[data-testid="stSidebar"] .stRadio > label {
+    color: white !important;
+    font-weight: 600;
+}
+
+[data-testid="stSidebar"] label[data-baseweb="radio"] {
+    background: rgba(255,255,255,0.1);
+    padding: 12px 16px;
+    border-radius: 8px;
+    margin: 4px 0;
+    transition: all 0.3s;
+}
+
+[data-testid="stSidebar"] label[data-baseweb="radio"]:hover {
+    background: rgba(255,255,255,0.2);
+    transform: translateX(5px);
+}
+
+/* Metric Cards */
+.metric-card {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    padding: 24px;
+    border-radius: 16px;
+    text-align: center;
+    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    transition: transform 0.3s;
+}
+
+.metric-card:hover {
+    transform: translateY(-5px);
+}
+
+.metric-icon {
+    font-size: 36px;
+    margin-bottom: 12px;
+}
+
+.metric-value {
+    font-size: 32px;
+    font-weight: 700;
+    color: white;
+    margin: 8px 0;
+}
+
+.metric-label {
+    font-size: 14px;
+    color: rgba(255,255,255,0.9);
+    font-weight: 500;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}
+
+/* Item Cards */
+.item-card {
+    background: white;
+    border: 2px solid #e5e7eb;
+    border-radius: 16px;
+    padding: 20px;
+    margin: 12px 0;
+    transition: all 0.3s;
+}
+
+.item-card:hover {
+    border-color: #3b82f6;
+    box-shadow: 0 8px 16px rgba(59,130,246,0.2);
+    transform: translateY(-2px);
+}
+
+.item-thumb {
+    float: left;
+    width: 56px;
+    height: 56px;
+    object-fit: cover;
+    border-radius: 10px;
+    margin-right: 16px;
+}
+
+.item-name {
+    font-size: 18px;
+    font-weight: 700;
+    color: #1f2937;
+    margin: 8px 0;
+}
+
+.item-category {
+    display: inline-block;
+    background: #dbeafe;
+    color: #1e40af;
+    padding: 4px 12px;
+    border-radius: 20px;
+    font-size: 12px;
+    font-weight: 600;
+    margin: 8px 0;
+}
+
+/* Status Badge */
+.status-badge {
+    display: inline-flex;
+    align-items: center;
+    gap: 6px;
+    padding: 8px 16px;
+    border-radius: 20px;
+    font-weight: 600;
+    font-size: 14px;
+}
+
+/* Buttons */
+.stButton > button {
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    color: white;
+    border: none;
+    border-radius: 10px;
+    padding: 12px 24px;
+    font-weight: 600;
+    transition: all 0.3s;
+    box-shadow: 0 4px 6px rgba(102,126,234,0.3);
+}
+
+.stButton > button:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 6px 12px rgba(102,126,234,0.4);
+}
+
+/* Headers */
+h1 {
+    color: #1f2937;
+    font-weight: 700;
+    margin-bottom: 24px;
+}
+
+h3 {
+    color: #374151;
+    font-weight: 600;
+    margin: 24px 0 16px 0;
+}
+
+/* Input Fields */
+.stTextInput input, .stNumberInput input {
+    border-radius: 8px;
+    border: 2px solid #e5e7eb;
+    padding: 12px;
+    transition: border-color 0.3s;
+}
+
+.stTextInput input:focus, .stNumberInput input:focus {
+    border-color: #667eea;
+    box-shadow: 0 0 0 3px rgba(102,126,234,0.1);
+}
+
+/* File Uploader */
+.stFileUploader {
+    border: 2px dashed #d1d5db;
+    border-radius: 12px;
+    padding: 24px;
+    background: #f9fafb;
+}
+
+/* Chart styling */
+.stBarChart {
+    background: white;
+    padding: 20px;
+    border-radius: 12px;
+    box-shadow: 0 2px 8px rgba(0,0,0,0.05);
+}
+</style>
+"""
+
+
+@st.cache_resource
+def _styles_minified() -> str:
+    """STYLES tanpa komentar dan whitespace berlebih (sekali per proses; skrip dieksekusi ulang tiap rerun)"""
+    css = re.sub(r"/\*.*?\*/", "", STYLES, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    return re.sub(r"\s*([{};])\s*", r"\1", css).strip()
+
+
 def apply_styles():
     """CSS styling dengan warna menarik"""
-    st.markdown("""
-    <style>
-    @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
-    
-    * {
-        font-family: 'Inter', sans-serif;
-    }
-    
-    /* Sidebar */
-    [data-testid="stSidebar"] {
-        background: linear-gradient(180deg, #1e3a8a 0%, #3b82f6 100%);
-    }
-    
-    [data-testid="stSidebar"] h1 {
-        color: white !important;
-        font-size: 28px;
-        font-weight: 700;
-        text-align: center;
-        margin-bottom: 10px;
-    }
-    
-    [data-testid="stSidebar"] p {
-        color: rgba(255,255,255,0.8);
-        text-align: center;
-        font-size: 14px;
-    }
-    
-    /* Radio buttons di sidebar */
-    [data-testid="stSidebar"] .stRadio > label {
-        color: white !important;
-        font-weight: 600;
-    }
-    
-    [data-testid="stSidebar"] label[data-baseweb="radio"] {
-        background: rgba(255,255,255,0.1);
-        padding: 12px 16px;
-        border-radius: 8px;
-        margin: 4px 0;
-        transition: all 0.3s;
-    }
-    
-    [data-testid="stSidebar"] label[data-baseweb="radio"]:hover {
-        background: rgba(255,255,255,0.2);
-        transform: translateX(5px);
-    }
-    
-    /* Metric Cards */
-    .metric-card {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        padding: 24px;
-        border-radius: 16px;
-        text-align: center;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        transition: transform 0.3s;
-    }
-    
-    .metric-card:hover {
-        transform: translateY(-5px);
-    }
-    
-    .metric-icon {
-        font-size: 36px;
-        margin-bottom: 12px;
-    }
-    
-    .metric-value {
-        font-size: 32px;
-        font-weight: 700;
-        color: white;
-        margin: 8px 0;
-    }
-    
-    .metric-label {
-        font-size: 14px;
-        color: rgba(255,255,255,0.9);
-        font-weight: 500;
-        text-transform: uppercase;
-        letter-spacing: 1px;
-    }
-    
-    /* Item Cards */
-    .item-card {
-        background: white;
-        border: 2px solid #e5e7eb;
-        border-radius: 16px;
-        padding: 20px;
-        margin: 12px 0;
-        transition: all 0.3s;
-    }
-    
-    .item-card:hover {
-        border-color: #3b82f6;
-        box-shadow: 0 8px 16px rgba(59,130,246,0.2);
-        transform: translateY(-2px);
-    }
-    
-    .item-name {
-        font-size: 18px;
-        font-weight: 700;
-        color: #1f2937;
-        margin: 8px 0;
-    }
-    
-    .item-category {
-        display: inline-block;
-        background: #dbeafe;
-        color: #1e40af;
-        padding: 4px 12px;
-        border-radius: 20px;
-        font-size: 12px;
-        font-weight: 600;
-        margin: 8px 0;
-    }
-    
-    /* Status Badge */
-    .status-badge {
-        display: inline-flex;
-        align-items: center;
-        gap: 6px;
-        padding: 8px 16px;
-        border-radius: 20px;
-        font-weight: 600;
-        font-size: 14px;
-    }
-    
-    /* Buttons */
-    .stButton > button {
-        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        color: white;
-        border: none;
-        border-radius: 10px;
-        padding: 12px 24px;
-        font-weight: 600;
-        transition: all 0.3s;
-        box-shadow: 0 4px 6px rgba(102,126,234,0.3);
-    }
-    
-    .stButton > button:hover {
-        transform: translateY(-2px);
-        box-shadow: 0 6px 12px rgba(102,126,234,0.4);
-    }
-    
-    /* Headers */
-    h1 {
-        color: #1f2937;
-        font-weight: 700;
-        margin-bottom: 24px;
-    }
-    
-    h3 {
-        color: #374151;
-        font-weight: 600;
-        margin: 24px 0 16px 0;
-    }
-    
-    /* Input Fields */
-    .stTextInput input, .stNumberInput input {
-        border-radius: 8px;
-        border: 2px solid #e5e7eb;
-        padding: 12px;
-        transition: border-color 0.3s;
-    }
-    
-    .stTextInput input:focus, .stNumberInput input:focus {
-        border-color: #667eea;
-        box-shadow: 0 0 0 3px rgba(102,126,234,0.1);
-    }
-    
-    /* File Uploader */
-    .stFileUploader {
-        border: 2px dashed #d1d5db;
-        border-radius: 12px;
-        padding: 24px;
-        background: #f9fafb;
-    }
-    
-    /* Chart styling */
-    .stBarChart {
-        background: white;
-        padding: 20px;
-        border-radius: 12px;
-        box-shadow: 0 2px 8px rgba(0,0,0,0.05);
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # Streamlit menghapus elemen yang tidak dirender ulang, jadi CSS tetap
+    # dikirim tiap rerun; yang di-cache adalah versi minified-nya
+    st.markdown(_styles_minified(), unsafe_allow_html=True)
 
 # ======================
 # PAGE RENDERERS
 # ======================
+PAGE_SIZE_OPTIONS = [10, 25, 50, 100]
+
+IMAGE_TYPES = ["png", "jpg", "jpeg", "webp", "gif"]
+
+SORT_OPTIONS = {
+    "Default": (None, False),
+    "Name (A-Z)": ("nama", False),
+    "Name (Z-A)": ("nama", True),
+    "Stock (lowest)": ("jumlah", False),
+    "Stock (highest)": ("jumlah", True),
+}
+
+@diukur
 def render_dashboard(manager: StockManager):
     """Dashboard dengan metrics"""
     st.markdown("<h1>🏠 Dashboard</h1>", unsafe_allow_html=True)
@@ -410,14 +2493,15 @@ def render_dashboard(manager: StockManager):
     
     # Recent Items
     st.markdown("### 🕐 Recent Items")
-    items = manager.inventory_repo.get_all()
+    items = manager.inventory_repo.get_terbaru(5)
     if items:
-        for barang in items[-5:]:
+        for barang in items:
             icon, status, bg, text = barang.get_status()
             st.markdown(f"""
             <div class='item-card'>
                 <div style='display: flex; justify-content: space-between; align-items: center;'>
                     <div>
+                        {_thumb_html(manager, barang)}
                         <div class='item-name'>{barang.nama}</div>
                         <span class='item-category'>{barang.category}</span>
                     </div>
@@ -430,6 +2514,7 @@ def render_dashboard(manager: StockManager):
     else:
         st.info("📦 No items yet. Add your first item!")
 
+@diukur
 def render_add_item(manager: StockManager):
     """Form tambah item"""
     st.markdown("<h1>➕ Add New Item</h1>", unsafe_allow_html=True)
@@ -442,30 +2527,55 @@ def render_add_item(manager: StockManager):
                                   ["Electronics", "Furniture", "Stationery", "Tools", "Other"])
         
         jumlah = st.number_input("📊 Quantity", min_value=0, value=1)
+        gambar = st.file_uploader("🖼️ Image (optional)", type=IMAGE_TYPES)
         
         if st.form_submit_button("✅ Add Item", use_container_width=True):
             if nama:
-                manager.tambah_barang(nama, jumlah, category)
+                image_path = manager.simpan_gambar(gambar.getvalue(), gambar.name) if gambar else ""
+                with tulisan_sendiri(manager.inventory_repo):
+                    manager.tambah_barang(nama, jumlah, category, image_path)
                 st.success(f"✅ '{nama}' added successfully!")
                 st.balloons()
             else:
                 st.error("❌ Please enter item name")
 
+@diukur
 def render_items(manager: StockManager):
-    """List semua items"""
+    """List semua items (dipaginasi)"""
     st.markdown("<h1>📋 All Items</h1>", unsafe_allow_html=True)
+    repo = manager.inventory_repo
+    
+    # Search, filter & sort
+    col_search, col_cat, col_sort, col_size = st.columns([3, 2, 2, 1])
+    search = col_search.text_input("🔍 Search", placeholder="Search items...")
+    categories = repo.get_categories()
+    category = col_cat.selectbox("📁 Category", ["All"] + categories)
+    sort_label = col_sort.selectbox("↕️ Sort", list(SORT_OPTIONS))
+    page_size = col_size.selectbox("Per page", PAGE_SIZE_OPTIONS)
+    sort_by, descending = SORT_OPTIONS[sort_label]
+    
+    filters = dict(
+        search=search,
+        category=None if category == "All" else category,
+        sort_by=sort_by,
+        descending=descending
+    )
+    page = st.session_state.get("items_page", 1)
+    total, items = repo.query(**filters, offset=(page - 1) * page_size, limit=page_size)
+    pages = max(1, -(-total // page_size))
+    if page > pages:
+        # Filter berubah dan halaman lama sudah di luar jangkauan
+        page = pages
+        total, items = repo.query(**filters, offset=(page - 1) * page_size, limit=page_size)
+    st.session_state.items_page = page
     
-    # Search
-    search = st.text_input("🔍 Search", placeholder="Search items...")
-    items = manager.inventory_repo.get_by_nama(search) if search else manager.inventory_repo.get_all()
-    
-    st.markdown(f"**{len(items)} items found**")
+    st.markdown(f"**{total} items found** · page {page} / {pages}")
     
     if not items:
         st.info("📦 No items found. Try different search terms or add new items.")
         return
     
-    # Items list
+    # Items list (hanya halaman aktif yang dirender)
     for barang in items:
         icon, status, bg, text = barang.get_status()
         
@@ -474,6 +2584,7 @@ def render_items(manager: StockManager):
         with col1:
             st.markdown(f"""
             <div class='item-card'>
+                {_thumb_html(manager, barang)}
                 <div class='item-name'>{barang.nama}</div>
                 <span class='item-category'>{barang.category}</span>
                 <span class='status-badge' style='background: {bg}; color: {text}; margin-left: 12px;'>
@@ -498,9 +2609,41 @@ def render_items(manager: StockManager):
             if st.button("🗑️", key=f"del_{barang.id}", help="Delete"):
                 manager.inventory_repo.delete_barang(barang.id)
                 st.rerun()
+    
+    # Navigasi halaman
+    if pages > 1:
+        col_prev, col_num, col_next = st.columns([1, 2, 1])
+        col_prev.button("⬅️ Prev", disabled=page <= 1, use_container_width=True,
+                        on_click=_ganti_halaman, args=(-1,))
+        col_num.number_input("Page", min_value=1, max_value=pages, key="items_page",
+                             label_visibility="collapsed")
+        col_next.button("Next ➡️", disabled=page >= pages, use_container_width=True,
+                        on_click=_ganti_halaman, args=(1,))
+    
+    # Ganti gambar barang di halaman ini
+    with st.expander("🖼️ Change item image"):
+        pilihan = {f"{b.nama} (#{b.id})": b.id for b in items}
+        label = st.selectbox("Item", list(pilihan))
+        gambar = st.file_uploader("Image", type=IMAGE_TYPES, key="item_image")
+        if gambar is not None and st.button("Save image"):
+            manager.ganti_gambar(pilihan[label], gambar.getvalue(), gambar.name)
+            st.success("✅ Image updated")
+            st.rerun()
+
+def _thumb_html(manager: StockManager, barang: Barang) -> str:
+    """<img> thumbnail kecil (data URI) untuk kartu barang; kosong jika belum ada"""
+    uri = manager.image_store.thumbnail_data_uri(barang.image_path) if barang.image_path else None
+    return f"<img class='item-thumb' src='{uri}'/>" if uri else ""
 
+def _ganti_halaman(delta: int):
+    """Callback tombol Prev/Next"""
+    st.session_state.items_page += delta
+
+@diukur
 def render_reports(manager: StockManager):
     """Laporan dan statistik"""
+    import pandas as pd
+    
     st.markdown("<h1>📊 Reports</h1>", unsafe_allow_html=True)
     
     stats = manager.laporang_stok()
@@ -512,39 +2655,85 @@ def render_reports(manager: StockManager):
     col3.metric("📈 Average", f"{stats['total_quantity']/stats['total_items']:.1f}" if stats['total_items'] > 0 else "0")
     
     # Chart
-    items = manager.inventory_repo.get_all()
-    if items:
+    repo = manager.inventory_repo
+    if repo.count():
         st.markdown("### 📈 Top Items by Stock")
-        df = pd.DataFrame([{"Item": b.nama, "Quantity": b.jumlah} for b in items])
-        df = df.sort_values("Quantity", ascending=False).head(10)
+        df = pd.DataFrame(repo.get_top_items(10), columns=["Item", "Quantity"])
         st.bar_chart(df.set_index("Item"))
         
+        # Pergerakan stok dari rollup ledger
+        st.markdown("### 📉 Stock Movement")
+        periode = st.radio("Period", ["Last 30 days", "Last 48 hours"], horizontal=True,
+                           label_visibility="collapsed")
+        pergerakan = repo.get_pergerakan(hourly=periode == "Last 48 hours")
+        if any(masuk or keluar for _, masuk, keluar in pergerakan):
+            movement_df = pd.DataFrame(pergerakan, columns=["Time", "In", "Out"]).set_index("Time")
+            st.bar_chart(movement_df)
+        else:
+            st.caption("No stock movement recorded in this period.")
+        
+        cover = repo.get_days_of_cover()
+        if cover:
+            st.markdown("### ⏳ Days of Cover")
+            st.dataframe(pd.DataFrame(
+                [{"Item": b.nama, "Stock": b.jumlah, "Days of cover": round(hari, 1)} for b, hari in cover]
+            ), use_container_width=True, hide_index=True)
+        
+        # Daftar restock dari index stok terurut
+        st.markdown("### 🔻 Low Stock Finder")
+        col1, col2 = st.columns(2)
+        batas = col1.number_input("Stock at most", min_value=0, value=LOW_STOCK_LIMIT, step=1)
+        kategori = col2.selectbox("Category", ["All"] + repo.get_categories(), key="low_stock_category")
+        rendah = repo.get_stok_di_bawah(int(batas), None if kategori == "All" else kategori)
+        if rendah:
+            st.caption(f"{len(rendah)} items")
+            st.dataframe(pd.DataFrame(
+                [{"Item": b.nama, "Category": b.category, "Stock": b.jumlah} for b in rendah[:500]]
+            ), use_container_width=True, hide_index=True)
+        else:
+            st.caption("No items at or below this stock level.")
+        
         # Export
         st.markdown("### 📥 Export Data")
-        csv_data = df.to_csv(index=False)
-        st.download_button("⬇️ Download CSV Report", csv_data, "stockify_report.csv", "text/csv")
+        # File dibuat saat tombol diklik, ditulis per chunk
+        st.download_button("⬇️ Download CSV Report", manager.ekspor_csv_file,
+                           "stockify_report.csv", "text/csv")
         
         # Show raw data
         with st.expander("📄 View Raw CSV Data"):
-            full_df = pd.DataFrame([asdict(b) for b in items])
+            full_df = repo.to_frame()
             st.dataframe(full_df, use_container_width=True)
     else:
         st.info("📦 No data to display. Add some items first!")
 
+@diukur
+def _ubah_metrics():
+    METRICS.enabled = st.session_state.metrics_toggle
+
+
 def render_settings(manager: StockManager):
     """Pengaturan aplikasi"""
     st.markdown("<h1>⚙️ Settings</h1>", unsafe_allow_html=True)
     
     st.markdown("### 🗄️ Data Management")
     
+    load_errors = manager.inventory_repo.load_errors
+    if load_errors:
+        backups = manager.inventory_repo.load_backups
+        st.warning(f"⚠️ {len(load_errors)} problem(s) while loading `{manager.inventory_repo.filename}`; "
+                   "invalid rows were skipped and are dropped when the file is next rewritten. "
+                   + (f"The original was copied to `{'`, `'.join(backups)}`." if backups
+                      else "No backup copy could be made."))
+        with st.expander("Show load problems"):
+            st.code("\n".join(load_errors[:200]), language=None)
+    
     col1, col2 = st.columns(2)
     
     with col1:
         st.markdown("#### 🗑️ Clear All Data")
         if st.button("Clear All Data", use_container_width=True, type="secondary"):
             if st.checkbox("⚠️ I understand this will delete all data"):
-                manager.inventory_repo.barang_list = []
-                manager.inventory_repo._save_to_csv()
+                manager.inventory_repo.clear_all()
                 st.success("✅ All data cleared!")
                 st.rerun()
     
@@ -558,25 +2747,107 @@ def render_settings(manager: StockManager):
                 ("Hammer", 20, "Tools"),
                 ("USB Cable", 3, "Electronics")
             ]
-            for nama, qty, cat in demo:
-                manager.tambah_barang(nama, qty, cat)
+            manager.inventory_repo.create_banyak([(nama, qty, cat, "") for nama, qty, cat in demo])
             st.success("✅ Demo data loaded!")
             st.rerun()
     
+    # Bulk import/export
+    st.markdown("---")
+    st.markdown("### 📦 Bulk Import / Export")
+    st.caption("Kolom: `nama`, `jumlah`, `category` (opsional), `image_path` (opsional)")
+    
+    uploaded = st.file_uploader("Upload CSV or Parquet", type=["csv", "parquet"])
+    if uploaded is not None and st.button("📥 Import Items", type="primary"):
+        file_format = "parquet" if uploaded.name.lower().endswith(".parquet") else "csv"
+        bar = st.progress(0.0, text="Importing...")
+        try:
+            with tulisan_sendiri(manager.inventory_repo):
+                report = manager.impor_massal(
+                    uploaded, file_format,
+                    progress=lambda rows, fraction: bar.progress(fraction, text=f"{rows} rows read...")
+                )
+        except ValueError as e:
+            st.error(f"❌ {e}")
+        else:
+            bar.progress(1.0, text="Done")
+            st.success(f"✅ {report.imported} of {report.total_rows} rows imported")
+            if report.errors:
+                with st.expander(f"⚠️ {len(report.errors)} rows skipped"):
+                    st.code("\n".join(report.errors[:1000]))
+    
+    st.download_button("📤 Export All Items (CSV)", manager.ekspor_csv_file,
+                       "stockify_export.csv", "text/csv")
+    
+    # Performance
+    st.markdown("---")
+    st.markdown("### ⏱️ Performance")
+    # Flag berlaku untuk seluruh proses: hanya diubah lewat on_change, widget cuma menampilkan nilainya
+    st.session_state.metrics_toggle = METRICS.enabled
+    st.toggle("Record latency metrics", key="metrics_toggle", on_change=_ubah_metrics,
+              help="Berlaku untuk semua sesi. Default dari STOCKIFY_METRICS=1")
+    rows = METRICS.ringkasan()
+    if rows:
+        st.dataframe([{k: round(v, 3) if isinstance(v, float) else v for k, v in row.items()} for row in rows],
+                     use_container_width=True, hide_index=True)
+        written = METRICS.bytes_written()
+        if written:
+            st.caption(" · ".join(f"**{target}**: {n:,} bytes written" for target, n in written.items()))
+        col1, col2, col3 = st.columns(3)
+        col1.download_button("JSON", METRICS.to_json(), "stockify_metrics.json",
+                             "application/json", use_container_width=True)
+        col2.download_button("Prometheus", METRICS.to_prometheus(), "stockify_metrics.prom",
+                             "text/plain", use_container_width=True)
+        col3.button("Reset", on_click=METRICS.reset, use_container_width=True)
+    elif METRICS.enabled:
+        st.caption("No calls recorded yet.")
+    
     # File Info
     st.markdown("---")
     st.markdown("### 📁 File Information")
-    if os.path.exists(manager.inventory_repo.filename):
-        file_size = os.path.getsize(manager.inventory_repo.filename)
+    storage = manager.inventory_repo.storage
+    files = [f for f in storage.files() if os.path.exists(f)]
+    if files:
         st.info(f"""
-        **File:** `{manager.inventory_repo.filename}`  
-        **Size:** {file_size} bytes  
-        **Format:** CSV (Comma-Separated Values)  
+        **File:** `{files[0]}`  
+        **Size:** {os.path.getsize(files[0])} bytes  
+        **Format:** {storage.FORMAT}  
         **Encoding:** UTF-8
         """)
+        for extra in files[1:]:
+            st.caption(f"📝 `{extra}`: {os.path.getsize(extra)} bytes")
     else:
         st.warning("⚠️ Data file not created yet. Add items to create the file.")
 
+# ======================
+# SHARED STATE
+# ======================
+REFRESH_SECONDS = 3
+
+@st.cache_resource
+def get_manager(storage_mode: str) -> StockManager:
+    """Satu repository & manager bersama untuk semua sesi (file dimuat sekali per proses)"""
+    manager = StockManager(InventoryRepository(storage_mode=storage_mode))
+    port = os.environ.get("STOCKIFY_API_PORT")
+    if port:
+        # API JSON untuk scanner/integrasi memakai repository yang sama dengan UI
+        from api import start_in_thread
+        start_in_thread(manager, os.environ.get("STOCKIFY_API_HOST", "127.0.0.1"), int(port))
+    return manager
+
+def pantau_perubahan(repo: InventoryRepository):
+    """Rerun halaman saat sesi lain mengubah data"""
+    if repo.versi != st.session_state.get("versi_render", repo.versi):
+        st.rerun(scope="app")
+
+@contextmanager
+def tulisan_sendiri(repo: InventoryRepository):
+    """Majukan stempel render melewati tulisan sesi ini (tanpa st.rerun) agar tidak memicu rerun sendiri"""
+    sebelum = repo.versi
+    yield
+    # Hanya jika belum ada tulisan sesi lain sejak render dimulai; kalau ada, biarkan pantau_perubahan rerun
+    if st.session_state.get("versi_render") == sebelum:
+        st.session_state.versi_render = repo.versi
+
 # ======================
 # MAIN APP
 # ======================
@@ -589,14 +2860,10 @@ def main():
     
     apply_styles()
     
-    # Initialize dengan pattern yang benar
-    if 'repository' not in st.session_state:
-        st.session_state.repository = InventoryRepository()
-    
-    if 'manager' not in st.session_state:
-        st.session_state.manager = StockManager(st.session_state.repository)
-    
-    manager = st.session_state.manager
+    # Repository dibagi semua sesi, bukan satu salinan per sesi
+    manager = get_manager(os.environ.get("STOCKIFY_STORAGE", "csv"))
+    repo = manager.inventory_repo
+    st.session_state.versi_render = repo.versi
     
     # Sidebar
     with st.sidebar:
@@ -609,6 +2876,12 @@ def main():
             ["🏠 Dashboard", "➕ Add Item", "📋 Items", "📊 Reports", "⚙️ Settings"],
             label_visibility="collapsed"
         )
+        
+        if repo.load_errors:
+            st.caption(f"⚠️ {len(repo.load_errors)} load problem(s) — see Settings")
+        
+        if hasattr(st, "fragment"):
+            st.fragment(run_every=REFRESH_SECONDS)(pantau_perubahan)(repo)
     
     # Render page
     pages = {
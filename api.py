@@ -0,0 +1,277 @@
+# api.py - JSON API Stockify untuk barcode scanner & integrasi (asyncio, tanpa dependency)
+# Jalankan: python api.py [--port 8765] [--storage journal]
+# Atau bersama UI (repository yang sama): STOCKIFY_API_PORT=8765 streamlit run TUBES.py
+#
+# Endpoint:
+#   GET  /health
+#   GET  /stats
+#   GET  /items?search=&category=&offset=0&limit=50
+#   GET  /items/<id>
+#   POST /items                 {"nama": ..., "jumlah": ..., "category": ..., "image_path": ...}
+#   POST /items/<id>/stock      {"delta": n}            (digabung per jendela waktu)
+#   POST /batch                 {"movements": [[id, delta], ...], "atomic": true}
+
+import argparse
+import asyncio
+import json
+import threading
+from dataclasses import asdict
+from typing import Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+MAX_BODY = 10 * 1024 * 1024
+
+STATUS_TEXT = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+               405: "Method Not Allowed", 409: "Conflict", 413: "Payload Too Large",
+               500: "Internal Server Error"}
+
+
+class HttpError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+# ======================
+# COALESCER
+# ======================
+class StockCoalescer:
+    """Gabungkan request stok tunggal menjadi satu batch per jendela waktu.
+
+    Request pertama membuka jendela ``window_ms``; semua pergerakan yang masuk
+    selama jendela itu (maksimal ``max_batch``) diproses dengan satu
+    ``proses_sebagian`` = satu persist. Setiap request tetap mendapat hasilnya
+    sendiri (None atau pesan error).
+    """
+
+    def __init__(self, manager, window_ms: float = 5.0, max_batch: int = 1000):
+        self.manager = manager
+        self.window = window_ms / 1000
+        self.max_batch = max_batch
+        self._pending: List[Tuple[str, int, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._urut = asyncio.Lock()  # batch diproses berurutan sesuai kedatangan
+        self._tasks: Set[asyncio.Task] = set()  # referensi kuat sampai task selesai
+        self.batches = 0
+        self.movements = 0
+
+    async def ubah(self, barang_id: str, delta: int) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((barang_id, delta, future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.ensure_future(self._proses(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _proses(self, batch: List[Tuple[str, int, asyncio.Future]]):
+        movements = [(barang_id, delta) for barang_id, delta, _ in batch]
+        async with self._urut:
+            try:
+                errors = await asyncio.get_running_loop().run_in_executor(
+                    None, self.manager.proses_sebagian, movements)
+            except Exception as e:
+                for _, _, future in batch:
+                    future.set_exception(e)
+                return
+        self.batches += 1
+        self.movements += len(batch)
+        for i, (_, _, future) in enumerate(batch):
+            future.set_result(errors.get(i))
+
+
+# ======================
+# HTTP SERVER
+# ======================
+class ApiServer:
+    """Server HTTP/1.1 minimal (keep-alive, JSON) di atas asyncio streams"""
+
+    def __init__(self, manager, host: str = "127.0.0.1", port: int = 8765, window_ms: float = 5.0):
+        self.manager = manager
+        self.repo = manager.inventory_repo
+        self.host = host
+        self.port = port
+        self.window_ms = window_ms
+        self.coalescer: Optional[StockCoalescer] = None
+
+    async def serve(self):
+        self.coalescer = StockCoalescer(self.manager, self.window_ms)
+        server = await asyncio.start_server(self._koneksi, self.host, self.port)
+        print(f"Stockify API listening on http://{self.host}:{self.port}")
+        async with server:
+            await server.serve_forever()
+
+    async def _koneksi(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, target, version = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY:
+                    status, payload = 413, {"error": "request body too large"}
+                    headers["connection"] = "close"  # body tidak dibaca, koneksi tidak bisa dipakai ulang
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self._dispatch(method, target, body)
+
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and not version.strip().upper().endswith("1.0"))
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, object]:
+        url = urlsplit(target)
+        parts = [p for p in url.path.split("/") if p]
+        try:
+            data = json.loads(body) if body else {}
+            if not isinstance(data, dict):
+                raise HttpError(400, "request body must be a JSON object")
+            loop = asyncio.get_running_loop()
+            if parts == ["health"]:
+                return 200, {"ok": True}
+            # Query yang memakai lock repository jalan di executor: persist CSV bisa
+            # menahan lock itu lama dan tidak boleh membekukan event loop
+            if parts == ["stats"] and method == "GET":
+                return 200, await loop.run_in_executor(None, self.manager.laporang_stok)
+            if parts == ["items"]:
+                if method == "GET":
+                    return 200, await loop.run_in_executor(None, self._list, parse_qs(url.query))
+                if method == "POST":
+                    return 201, await self._create(data)
+            if len(parts) == 2 and parts[0] == "items" and method == "GET":
+                barang = self.repo.get_by_id(parts[1])
+                if barang is None:
+                    raise HttpError(404, f"item {parts[1]!r} not found")
+                return 200, asdict(barang)
+            if len(parts) == 3 and parts[0] == "items" and parts[2] == "stock" and method == "POST":
+                error = await self.coalescer.ubah(parts[1], _int(data, "delta"))
+                if error:
+                    raise HttpError(409, error)
+                return 200, {"ok": True, "jumlah": self.manager.cek_stok(parts[1])}
+            if parts == ["batch"] and method == "POST":
+                return 200, await self._batch(data)
+            raise HttpError(404 if method in ("GET", "POST") else 405, f"no route for {method} {url.path}")
+        except HttpError as e:
+            return e.status, {"error": str(e)}
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            return 500, {"error": str(e)}
+
+    def _list(self, query: Dict[str, List[str]]) -> Dict:
+        def arg(name, default=None):
+            return query.get(name, [default])[0]
+        total, items = self.repo.query(search=arg("search", ""), category=arg("category"),
+                                       offset=int(arg("offset", 0)), limit=int(arg("limit", 50)))
+        return {"total": total, "items": [asdict(b) for b in items]}
+
+    async def _create(self, data: Dict) -> Dict:
+        nama = str(data.get("nama", "")).strip()
+        if not nama:
+            raise ValueError("'nama' is required")
+        jumlah = _int(data, "jumlah", 0)
+        if jumlah < 0:
+            raise ValueError("'jumlah' must be >= 0")
+        barang = await asyncio.get_running_loop().run_in_executor(
+            None, self.manager.tambah_barang, nama, jumlah,
+            str(data.get("category") or "Other"), str(data.get("image_path") or ""))
+        return asdict(barang)
+
+    async def _batch(self, data: Dict) -> Dict:
+        raw = data.get("movements", [])
+        if not isinstance(raw, list):
+            raise ValueError("'movements' must be a list")
+        movements = []
+        for m in raw:
+            try:
+                barang_id, delta = (m["id"], m["delta"]) if isinstance(m, dict) else m
+            except (KeyError, TypeError, ValueError):
+                raise ValueError('each movement must be [id, delta] or {"id": ..., "delta": ...}')
+            movements.append((str(barang_id), _int({"delta": delta}, "delta")))
+        loop = asyncio.get_running_loop()
+        if data.get("atomic", True):
+            result = await loop.run_in_executor(None, self.manager.proses_batch, movements)
+            if not result.ok:
+                raise HttpError(409, "; ".join(result.errors[:100]))
+            return asdict(result)
+        errors = await loop.run_in_executor(None, self.manager.proses_sebagian, movements)
+        return {"ok": not errors, "applied": len(movements) - len(errors),
+                "errors": {str(i): pesan for i, pesan in errors.items()}}
+
+
+def _int(data: Dict, key: str, default: Optional[int] = None) -> int:
+    value = data.get(key, default)
+    if isinstance(value, bool) or value is None or (isinstance(value, float) and not value.is_integer()):
+        raise ValueError(f"'{key}' must be an integer")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{key}' must be an integer")
+
+
+def start_in_thread(manager, host: str = "127.0.0.1", port: int = 8765) -> ApiServer:
+    """Jalankan API di thread latar (event loop sendiri), berbagi manager dengan UI"""
+    server = ApiServer(manager, host, port)
+    thread = threading.Thread(target=asyncio.run, args=(server.serve(),),
+                              name="stockify-api", daemon=True)
+    thread.start()
+    return server
+
+
+def main():
+    from TUBES import InventoryRepository, StockManager, STORAGE_MODES
+
+    parser = argparse.ArgumentParser(description="Stockify JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--file", default="inventory.csv")
+    parser.add_argument("--storage", default="csv", choices=list(STORAGE_MODES))
+    parser.add_argument("--window-ms", type=float, default=5.0, help="Jendela penggabungan request stok")
+    args = parser.parse_args()
+
+    manager = StockManager(InventoryRepository(args.file, storage_mode=args.storage))
+    server = ApiServer(manager, args.host, args.port, args.window_ms)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        c = server.coalescer
+        if c is not None and c.batches:
+            print(f"{c.movements} stock requests in {c.batches} batches")
+
+
+if __name__ == "__main__":
+    main()
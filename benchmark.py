@@ -0,0 +1,429 @@
+# benchmark.py - Micro-benchmark untuk layer inventory Stockify
+# Jalankan: python benchmark.py index | columnar | storage | startup | workload | load
+
+import argparse
+import csv
+import json
+import os
+import random
+import subprocess
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from timeit import timeit
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from TUBES import (Barang, CsvSnapshot, CsvStorage, InventoryRepository, KolomStore, SqliteStorage,
+                   StockManager, STORAGE_MODES, _barang_dari_row, _parse_csv_per_baris,
+                   _parse_csv_vektor)
+
+def buat_barang(n: int) -> List[Barang]:
+    """Buat n barang dummy"""
+    return [
+        Barang(id=str(i), nama=f"Item {i}", jumlah=i % 50, category="Tools",
+               image_path="", created_at="2025-01-01 00:00")
+        for i in range(1, n + 1)
+    ]
+
+
+def repo_kosong(tmpdir: str) -> InventoryRepository:
+    """Repository di direktori sementara tanpa data"""
+    return InventoryRepository(os.path.join(tmpdir, "inventory.csv"))
+
+
+# ======================
+# INDEX: SCAN VS DICT
+# ======================
+def bench_index(sizes: List[int], lookups: int = 1000):
+    """Bandingkan lookup/hapus berbasis scan dengan index id"""
+    print(f"{'items':>10} {'scan lookup':>14} {'index lookup':>14} {'scan delete':>14} {'index delete':>14}")
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n in sizes:
+            barang_list = buat_barang(n)
+            repo = repo_kosong(tmpdir)
+            repo._set_items(barang_list)
+            ids = [str(rng.randint(1, n)) for _ in range(lookups)]
+            
+            def index_lookup():
+                for barang_id in ids:
+                    repo.get_by_id(barang_id)
+            
+            # Jumlah iterasi scan dibatasi supaya 1M tetap selesai dalam hitungan detik
+            scan_n = max(1, min(lookups, 10_000_000 // n))
+            t_scan = timeit(lambda: [next(b for b in barang_list if b.id == i) for i in ids[:scan_n]], number=1) / scan_n
+            t_index = timeit(index_lookup, number=1) / lookups
+            
+            # Delete: list comprehension (versi lama) vs dict.pop
+            victim = ids[0]
+            t_scan_del = timeit(lambda: [b for b in barang_list if b.id != victim], number=1)
+            t_index_del = timeit(lambda: repo._index.pop(victim, None), number=1)
+            
+            print(f"{n:>10} {t_scan * 1e6:>12.2f}us {t_index * 1e6:>12.2f}us "
+                  f"{t_scan_del * 1e6:>12.2f}us {t_index_del * 1e6:>12.2f}us")
+
+
+# ======================
+# COLUMNAR STORE
+# ======================
+@dataclass
+class BarangDict:
+    """Barang versi lama (tanpa __slots__) sebagai pembanding memori"""
+    id: str
+    nama: str
+    jumlah: int
+    category: str
+    image_path: str
+    created_at: str
+
+
+def _ukur_memori(fn) -> int:
+    tracemalloc.start()
+    obj = fn()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def bench_columnar(sizes: List[int]):
+    """Bandingkan memori per item dan waktu membangun DataFrame.
+    
+    ``repo B/item`` adalah seluruh InventoryRepository (Barang, index, stats,
+    id allocator, ...), bukan hanya list Barang.
+    """
+    categories = ["Electronics", "Furniture", "Stationery", "Tools", "Other"]
+    
+    def rows(n):
+        return [(str(i), f"Item {i}", i % 50, categories[i % 5], "", "2025-01-01 00:00")
+                for i in range(1, n + 1)]
+    
+    def repo_penuh(tmpdir, data):
+        repo = repo_kosong(tmpdir)
+        repo._set_items([Barang(*r) for r in data])
+        return repo
+    
+    print(f"{'items':>10} {'dict B/item':>12} {'slots B/item':>13} {'repo B/item':>12} "
+          f"{'asdict df':>12} {'kolom df':>12}")
+    for n in sizes:
+        data = rows(n)
+        mem_dict = _ukur_memori(lambda: [BarangDict(*r) for r in data]) / n
+        mem_slots = _ukur_memori(lambda: [Barang(*r) for r in data]) / n
+        with tempfile.TemporaryDirectory() as tmpdir:
+            mem_repo = _ukur_memori(lambda: repo_penuh(tmpdir, data)) / n
+        
+        barang_list = [Barang(*r) for r in data]
+        t_asdict = timeit(lambda: pd.DataFrame([asdict(b) for b in barang_list]), number=1)
+        # Snapshot kolom dibangun per versi data, jadi ikut terukur
+        t_kolom = timeit(lambda: KolomStore.dari(barang_list).to_frame(), number=1)
+        
+        print(f"{n:>10} {mem_dict:>12.0f} {mem_slots:>13.0f} {mem_repo:>12.0f} "
+              f"{t_asdict * 1e3:>10.1f}ms {t_kolom * 1e3:>10.1f}ms")
+
+
+# ======================
+# STORAGE BACKENDS
+# ======================
+def bench_storage(sizes: List[int], modes: List[str]):
+    """Bandingkan waktu load dan latensi satu perubahan stok per backend"""
+    print(f"{'items':>10} {'mode':>8} {'load':>10} {'update':>12} {'create':>12}")
+    for n in sizes:
+        for mode in modes:
+            with tempfile.TemporaryDirectory() as tmpdir:
+                filename = os.path.join(tmpdir, "inventory.csv")
+                CsvStorage(filename).simpan_semua(buat_barang(n))
+                if mode == "sqlite":
+                    SqliteStorage(filename)  # migrasi awal dari CSV, di luar pengukuran
+                
+                t_load = timeit(lambda: InventoryRepository(filename, storage_mode=mode), number=1)
+                repo = InventoryRepository(filename, storage_mode=mode)
+                manager = StockManager(repo)
+                
+                # Backend CSV menulis ulang seluruh file per klik, jadi jumlah ulangan dibatasi
+                repeat = max(3, min(200, 2_000_000 // n))
+                ids = [str(random.randint(1, n)) for _ in range(repeat)]
+                t_update = timeit(lambda: [manager.tambah_stok(i, 1) for i in ids], number=1) / repeat
+                t_create = timeit(lambda: [manager.tambah_barang("Baru", 1, "Tools") for _ in range(repeat)],
+                                  number=1) / repeat
+                
+                print(f"{n:>10} {mode:>8} {t_load * 1e3:>8.1f}ms "
+                      f"{t_update * 1e3:>10.3f}ms {t_create * 1e3:>10.3f}ms")
+
+
+# ======================
+# STARTUP
+# ======================
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Dijalankan di proses baru supaya cache import tidak ikut terukur
+_RENDER_SCRIPT = """
+import json, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=60)
+at.run()
+hasil = {"first_render": time.perf_counter() - t0, "pages": {}}
+for page in at.sidebar.radio[0].options:
+    t = time.perf_counter()
+    at.sidebar.radio[0].set_value(page).run()
+    hasil["pages"][page] = [time.perf_counter() - t, "pandas" in sys.modules]
+print(json.dumps(hasil))
+"""
+
+
+def _importtime(module: str) -> List[tuple]:
+    """(cumulative us, self us, nama modul) dari ``python -X importtime``"""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=APP_DIR, capture_output=True, text=True, check=True)
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), int(self_us), name.rstrip()))
+    return rows
+
+
+def bench_startup(runs: int = 3, top: int = 10):
+    """Import time TUBES.py (cold) dan waktu render pertama per halaman via AppTest"""
+    totals = []
+    for _ in range(runs):
+        rows = _importtime("TUBES")
+        totals.append(next(c for c, _, name in rows if name.strip() == "TUBES"))
+    print(f"import TUBES: min {min(totals) / 1e3:.1f}ms, max {max(totals) / 1e3:.1f}ms ({runs} runs)")
+    print(f"\n{'cumulative':>12} {'self':>10}  module (top {top})")
+    for cumulative, self_us, name in sorted(rows, reverse=True)[1:top + 1]:
+        print(f"{cumulative / 1e3:>10.1f}ms {self_us / 1e3:>8.1f}ms {name}")
+    
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Data kosong di direktori sementara, CSV repo tidak tersentuh
+        proc = subprocess.run([sys.executable, "-c", _RENDER_SCRIPT, os.path.join(APP_DIR, "TUBES.py")],
+                              cwd=tmpdir, capture_output=True, text=True, check=True,
+                              env={**os.environ, "PYTHONPATH": APP_DIR})
+    hasil = json.loads(proc.stdout.strip().splitlines()[-1])
+    print(f"\ntime to first render: {hasil['first_render'] * 1e3:.0f}ms")
+    print(f"{'page':>16} {'render':>10} {'pandas loaded':>14}")
+    for page, (detik, pandas_loaded) in hasil["pages"].items():
+        print(f"{page:>16} {detik * 1e3:>8.0f}ms {str(pandas_loaded):>14}")
+
+
+# ======================
+# WORKLOAD SUITE
+# ======================
+WORKLOADS = ["load", "create", "update", "search", "stats", "batch", "delete"]
+
+
+def generate_inventory(n: int, categories: int = 10, skew: float = 1.0,
+                       name_len: Tuple[int, int] = (6, 24), seed: int = 42) -> List[Tuple[str, int, str, str]]:
+    """Baris (nama, jumlah, category, image_path) sintetis yang reproducible.
+    
+    ``skew`` adalah eksponen Zipf untuk distribusi kategori (0 = merata);
+    panjang nama diambil merata dari ``name_len``.
+    """
+    rng = random.Random(seed)
+    cats = [f"Category {i}" for i in range(categories)]
+    weights = [1 / (i + 1) ** skew for i in range(categories)]
+    huruf = string.ascii_lowercase + " "
+    rows = []
+    for cat in rng.choices(cats, weights=weights, k=n):
+        panjang = rng.randint(*name_len)
+        nama = rng.choice(string.ascii_uppercase) + "".join(rng.choice(huruf) for _ in range(panjang - 1))
+        rows.append((nama.strip() or "Item", rng.randint(0, 100), cat, ""))
+    return rows
+
+
+def _ukur(fn: Callable[[int], None], ops: int) -> Dict[str, float]:
+    """Jalankan fn(i) sebanyak ops kali; throughput + persentil latensi"""
+    latensi = []
+    mulai = time.perf_counter()
+    for i in range(ops):
+        t = time.perf_counter()
+        fn(i)
+        latensi.append(time.perf_counter() - t)
+    total = time.perf_counter() - mulai
+    latensi.sort()
+    
+    def persentil(q):
+        return latensi[min(len(latensi) - 1, int(q * len(latensi)))] * 1e3
+    
+    return {"ops": ops, "ops_per_s": ops / total if total else 0.0,
+            "p50_ms": persentil(0.50), "p99_ms": persentil(0.99)}
+
+
+def run_workloads(size: int, mode: str, ops: int, workloads: List[str],
+                  categories: int = 10, skew: float = 1.0, name_len: Tuple[int, int] = (6, 24),
+                  seed: int = 42) -> Dict[str, Dict[str, float]]:
+    """Jalankan workload terhadap InventoryRepository/StockManager tanpa Streamlit"""
+    rows = generate_inventory(size, categories, skew, name_len, seed)
+    rng = random.Random(seed)
+    hasil = {}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        filename = os.path.join(tmpdir, "inventory.csv")
+        InventoryRepository(filename, storage_mode=mode).create_banyak(rows)
+        
+        repo = None
+        def load(_):
+            nonlocal repo
+            repo = InventoryRepository(filename, storage_mode=mode)
+        # Load mahal, cukup beberapa kali; repo terakhir dipakai workload lain
+        hasil_load = _ukur(load, 3 if "load" in workloads else 1)
+        if "load" in workloads:
+            hasil["load"] = hasil_load
+        manager = StockManager(repo)
+        ids = [b.id for b in repo.get_all()]
+        kata = [nama.split()[0][:4] for nama, _, _, _ in rows[:1000]]
+        
+        operasi = {
+            "create": lambda i: manager.tambah_barang(f"Bench {i}", 1, "Category 0"),
+            "update": lambda i: manager.tambah_stok(rng.choice(ids), 1),
+            "search": lambda i: repo.cari(rng.choice(kata), limit=50),
+            "stats": lambda i: manager.laporang_stok(),
+            "batch": lambda i: manager.proses_batch([(rng.choice(ids), 1) for _ in range(50)]),
+            "delete": lambda i: repo.delete_barang(ids.pop()) if ids else None,
+        }
+        for nama in workloads:
+            if nama in operasi:
+                hasil[nama] = _ukur(operasi[nama], ops)
+    return hasil
+
+
+def bench_workload(args):
+    """Cetak hasil workload; simpan dan/atau bandingkan dengan baseline JSON"""
+    semua = {}
+    for size in args.sizes:
+        for mode in args.modes:
+            key = f"{mode}/{size}"
+            semua[key] = run_workloads(size, mode, args.ops, args.workloads, args.categories,
+                                       args.skew, tuple(args.name_len), args.seed)
+    
+    baseline: Optional[Dict] = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    
+    print(f"{'run':>16} {'workload':>8} {'ops/s':>12} {'p50':>10} {'p99':>10}"
+          + (f" {'vs baseline':>12}" if baseline else ""))
+    for key, hasil in semua.items():
+        for nama, r in hasil.items():
+            line = f"{key:>16} {nama:>8} {r['ops_per_s']:>12.1f} {r['p50_ms']:>8.3f}ms {r['p99_ms']:>8.3f}ms"
+            if baseline:
+                lama = baseline.get(key, {}).get(nama)
+                # Positif = lebih cepat dari baseline (throughput)
+                line += (f" {(r['ops_per_s'] / lama['ops_per_s'] - 1) * 100:>+11.1f}%"
+                         if lama and lama["ops_per_s"] else f" {'-':>12}")
+            print(line)
+    
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump(semua, f, indent=2)
+        print(f"\nsaved to {args.save}")
+
+
+# ======================
+# COLD LOAD
+# ======================
+def _terbaik(fn: Callable[[], object], runs: int) -> float:
+    """Waktu tercepat dari beberapa kali jalan (detik)"""
+    hasil = []
+    for _ in range(runs):
+        mulai = time.perf_counter()
+        fn()
+        hasil.append(time.perf_counter() - mulai)
+    return min(hasil)
+
+
+def bench_load(sizes: List[int], runs: int = 3):
+    """Waktu load CSV: DictReader lama vs parse vektor vs snapshot biner, plus repository penuh"""
+    print(f"{'items':>10} {'MB':>7} {'dictreader':>11} {'per-row':>10} {'vector':>10} "
+          f"{'snapshot':>10} {'repo cold':>10} {'repo warm':>10}")
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename = os.path.join(tmpdir, "inventory.csv")
+            CsvStorage(filename).simpan_semua([
+                Barang(str(i), nama, jumlah, category, image_path, "2025-01-01 00:00")
+                for i, (nama, jumlah, category, image_path) in enumerate(generate_inventory(n), 1)
+            ])
+            with open(filename, 'rb') as f:
+                data = f.read()
+            snapshot = CsvSnapshot(filename)
+            
+            def dictreader():
+                with open(filename, newline='', encoding='utf-8') as f:
+                    return [_barang_dari_row(row) for row in csv.DictReader(f)]
+            
+            def repo_cold():
+                if os.path.exists(snapshot.filename):
+                    os.remove(snapshot.filename)
+                InventoryRepository(filename)
+            
+            t_dict = _terbaik(dictreader, runs)
+            t_baris = _terbaik(lambda: _parse_csv_per_baris(data), runs)
+            t_vektor = _terbaik(lambda: _parse_csv_vektor(data), runs)
+            t_cold = _terbaik(repo_cold, runs)
+            InventoryRepository(filename)  # tulis snapshot (jika file cukup besar)
+            if os.path.exists(snapshot.filename):
+                t_snap = f"{_terbaik(snapshot.load, runs) * 1e3:>8.1f}ms"
+            else:
+                t_snap = f"{'-':>10}"
+            t_warm = _terbaik(lambda: InventoryRepository(filename), runs)
+            print(f"{n:>10} {len(data) / 1e6:>7.1f} {t_dict * 1e3:>9.1f}ms {t_baris * 1e3:>8.1f}ms "
+                  f"{t_vektor * 1e3:>8.1f}ms {t_snap} {t_cold * 1e3:>8.1f}ms {t_warm * 1e3:>8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Stockify")
+    sub = parser.add_subparsers(dest="bench", required=True)
+    
+    p_index = sub.add_parser("index", help="Lookup/delete: scan vs index id")
+    p_index.add_argument("--sizes", type=int, nargs="+", default=[1_000, 100_000, 1_000_000])
+    p_index.add_argument("--lookups", type=int, default=1000)
+    
+    p_columnar = sub.add_parser("columnar", help="Memori & DataFrame: dataclass vs kolom")
+    p_columnar.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    
+    p_storage = sub.add_parser("storage", help="Load & update: csv vs journal vs sqlite")
+    p_storage.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    p_storage.add_argument("--modes", nargs="+", default=list(STORAGE_MODES))
+    
+    p_startup = sub.add_parser("startup", help="Import time & time-to-first-render")
+    p_startup.add_argument("--runs", type=int, default=3)
+    p_startup.add_argument("--top", type=int, default=10)
+    
+    p_workload = sub.add_parser("workload", help="Workload sintetis: throughput & p50/p99")
+    p_workload.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    p_workload.add_argument("--modes", nargs="+", default=["journal"])
+    p_workload.add_argument("--ops", type=int, default=500)
+    p_workload.add_argument("--workloads", nargs="+", default=WORKLOADS, choices=WORKLOADS)
+    p_workload.add_argument("--categories", type=int, default=10)
+    p_workload.add_argument("--skew", type=float, default=1.0, help="Eksponen Zipf kategori (0 = merata)")
+    p_workload.add_argument("--name-len", type=int, nargs=2, default=[6, 24], metavar=("MIN", "MAX"))
+    p_workload.add_argument("--seed", type=int, default=42)
+    p_workload.add_argument("--save", help="Simpan hasil ke file JSON")
+    p_workload.add_argument("--baseline", help="Bandingkan dengan hasil JSON sebelumnya")
+    
+    p_load = sub.add_parser("load", help="Cold load CSV: parser lama vs vektor vs snapshot")
+    p_load.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    p_load.add_argument("--runs", type=int, default=3)
+    
+    args = parser.parse_args()
+    if args.bench == "index":
+        bench_index(args.sizes, args.lookups)
+    elif args.bench == "columnar":
+        bench_columnar(args.sizes)
+    elif args.bench == "storage":
+        bench_storage(args.sizes, args.modes)
+    elif args.bench == "startup":
+        bench_startup(args.runs, args.top)
+    elif args.bench == "workload":
+        bench_workload(args)
+    elif args.bench == "load":
+        bench_load(args.sizes, args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+# loadtest.py - Load test untuk api.py (jalankan API dulu: python api.py --storage journal)
+# Jalankan: python loadtest.py [--clients 50] [--requests 200] [--mode stock|batch|read]
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import List, Optional, Tuple
+
+
+class Client:
+    """Klien HTTP/1.1 keep-alive minimal (satu koneksi, request berurutan)"""
+
+    def __init__(self, host: str, port: int):
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def request(self, method: str, path: str, payload=None) -> Tuple[int, object]:
+        if self.writer is None:
+            self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+        )
+        await self.writer.drain()
+        status = int((await self.reader.readline()).split()[1])
+        length = 0
+        while True:
+            line = await self.reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            key, _, value = line.decode("latin-1").partition(":")
+            if key.lower() == "content-length":
+                length = int(value)
+        data = await self.reader.readexactly(length)
+        return status, json.loads(data) if data else None
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+async def siapkan_id(client: Client, minimal: int) -> List[str]:
+    """Ambil id barang yang ada; buat barang dummy jika kurang"""
+    _, hasil = await client.request("GET", f"/items?limit={minimal}")
+    ids = [b["id"] for b in hasil["items"]]
+    for i in range(len(ids), minimal):
+        _, barang = await client.request("POST", "/items",
+                                         {"nama": f"Load Test {i}", "jumlah": 1000, "category": "Tools"})
+        ids.append(barang["id"])
+    return ids
+
+
+async def jalankan(args):
+    setup = Client(args.host, args.port)
+    ids = await siapkan_id(setup, args.items)
+    setup.close()
+
+    latensi: List[float] = []
+    status_count = {}
+    rng = random.Random(args.seed)
+
+    async def worker():
+        client = Client(args.host, args.port)
+        try:
+            for _ in range(args.requests):
+                if args.mode == "stock":
+                    req = ("POST", f"/items/{rng.choice(ids)}/stock", {"delta": rng.choice([1, -1])})
+                elif args.mode == "batch":
+                    movements = [[rng.choice(ids), rng.choice([1, -1])] for _ in range(args.batch_size)]
+                    req = ("POST", "/batch", {"movements": movements, "atomic": False})
+                else:
+                    req = ("GET", f"/items/{rng.choice(ids)}", None)
+                mulai = time.perf_counter()
+                status, _ = await client.request(*req)
+                latensi.append(time.perf_counter() - mulai)
+                status_count[status] = status_count.get(status, 0) + 1
+        finally:
+            client.close()
+
+    mulai = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.clients)))
+    total = time.perf_counter() - mulai
+
+    latensi.sort()
+    def persentil(q):
+        return latensi[min(len(latensi) - 1, int(q * len(latensi)))] * 1e3
+
+    print(f"mode={args.mode} clients={args.clients} requests={len(latensi)} in {total:.2f}s")
+    print(f"throughput: {len(latensi) / total:.0f} req/s"
+          + (f" ({len(latensi) * args.batch_size / total:.0f} movements/s)" if args.mode == "batch" else ""))
+    print(f"latency: p50 {persentil(0.50):.2f}ms  p99 {persentil(0.99):.2f}ms  max {latensi[-1] * 1e3:.2f}ms")
+    print(f"status: {dict(sorted(status_count.items()))}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test Stockify API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200, help="Request per klien")
+    parser.add_argument("--mode", choices=["stock", "batch", "read"], default="stock")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--items", type=int, default=100, help="Jumlah barang yang dipakai")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(jalankan(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()